@@ -1968,9 +1968,14 @@ def songrequests_page():
             requested_by TEXT NOT NULL,
             requested_by_id TEXT NOT NULL,
             requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'queued'
+            status TEXT DEFAULT 'queued',
+            priority INTEGER NOT NULL DEFAULT 0
         )
     """)
+    # Add the priority column to queues created before it existed
+    columns = {row["name"] for row in cursor.execute("PRAGMA table_info(song_queue)")}
+    if "priority" not in columns:
+        cursor.execute("ALTER TABLE song_queue ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS song_blacklist (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -2053,7 +2058,10 @@ def songrequests_page():
     current_song = dict(current_row) if current_row else None
     
     # Get queue
-    cursor.execute("SELECT * FROM song_queue WHERE channel = ? AND status = 'queued' ORDER BY id", (channel,))
+    cursor.execute("""
+        SELECT * FROM song_queue WHERE channel = ? AND status = 'queued'
+        ORDER BY priority DESC, requested_at ASC, id ASC
+    """, (channel,))
     queue = [dict(row) for row in cursor.fetchall()]
     
     # Get blacklist
@@ -2110,7 +2118,10 @@ def skip_song():
         cursor.execute("UPDATE song_queue SET status = 'skipped' WHERE channel = ? AND status = 'playing'", (channel,))
         
         # Get next song and mark as playing
-        cursor.execute("SELECT id FROM song_queue WHERE channel = ? AND status = 'queued' ORDER BY id LIMIT 1", (channel,))
+        cursor.execute("""
+            SELECT id FROM song_queue WHERE channel = ? AND status = 'queued'
+            ORDER BY priority DESC, requested_at ASC, id ASC LIMIT 1
+        """, (channel,))
         next_song = cursor.fetchone()
         if next_song:
             cursor.execute("UPDATE song_queue SET status = 'playing' WHERE id = ?", (next_song["id"],))
@@ -2161,12 +2172,16 @@ def promote_song(song_id: int):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Get the minimum ID in queue
-        cursor.execute("SELECT MIN(id) as min_id FROM song_queue WHERE status = 'queued'")
-        row = cursor.fetchone()
-        if row and row["min_id"]:
-            # Update the song's ID to be before the minimum (hacky but works)
-            cursor.execute("UPDATE song_queue SET requested_at = datetime('now', '-1 hour') WHERE id = ?", (song_id,))
+        # Raise the song's priority above the rest of its channel's queue,
+        # the same way the bot's move_song_to_front does
+        cursor.execute("""
+            UPDATE song_queue
+            SET priority = (
+                SELECT COALESCE(MAX(q.priority), 0) + 1 FROM song_queue q
+                WHERE q.channel = song_queue.channel AND q.status = 'queued'
+            )
+            WHERE id = ?
+        """, (song_id,))
         
         conn.commit()
         conn.close()
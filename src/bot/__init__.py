@@ -22,6 +22,7 @@ def main() -> None:
     import signal
     import sys
 
+    from bot.utils.database import close_database
     from bot.utils.logging import setup_logging, get_logger
 
     # Load configuration
@@ -57,4 +58,5 @@ def main() -> None:
         logger.exception("Bot crashed with error: %s", e)
         sys.exit(1)
     finally:
+        close_database()
         logger.info("Bot shutdown complete")
@@ -12,11 +12,12 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from twitchio.ext import commands
 
 from bot.config import Config
+from bot.utils.database import get_database
 from bot.utils.logging import get_logger
 
 if TYPE_CHECKING:
@@ -24,6 +25,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Seconds between database maintenance passes (see DatabaseManager.run_maintenance)
+DB_MAINTENANCE_INTERVAL = 15 * 60
+
 
 class TwitchBot(commands.Bot):
     """
@@ -56,6 +60,7 @@ class TwitchBot(commands.Bot):
         self.config = config
         self.start_time = datetime.now(timezone.utc)
         self._ready = asyncio.Event()
+        self._maintenance_task: Optional[asyncio.Task] = None
 
         # Initialize the bot with TwitchIO
         super().__init__(
@@ -115,6 +120,20 @@ class TwitchBot(commands.Bot):
         logger.info("Connected to channels: %s", ", ".join(c.name for c in self.connected_channels))
         self._ready.set()
 
+        # event_ready fires again on reconnect; only start the loop once
+        if self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._db_maintenance_loop())
+
+    async def _db_maintenance_loop(self) -> None:
+        """Periodically run database maintenance (permit pruning, WAL checkpoint, optimize)."""
+        db = get_database()
+        while True:
+            await asyncio.sleep(DB_MAINTENANCE_INTERVAL)
+            try:
+                db.run_maintenance()
+            except Exception as e:
+                logger.error("Database maintenance failed: %s", e)
+
     async def event_channel_joined(self, channel: Channel) -> None:
         """
         Called when the bot joins a channel.
@@ -14,11 +14,12 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone, timedelta
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from twitchio.ext import commands
 from twitchio.ext.commands import Context
 
+from bot.utils.cache import TTLCache
 from bot.utils.database import get_database, DatabaseManager
 from bot.utils.logging import get_logger
 from bot.utils.permissions import is_owner, is_moderator, cooldown, CooldownBucket
@@ -31,6 +32,15 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Seconds a "no permit" lookup is remembered; !permit clears the cache
+NO_PERMIT_CACHE_TTL = 30
+NO_PERMIT_CACHE_SIZE = 4096
+
+# Filter settings are read for every message; the dashboard edits them, so
+# cached copies expire
+FILTER_SETTINGS_CACHE_TTL = 60  # seconds
+FILTER_SETTINGS_CACHE_SIZE = 256
+
 
 class AutoMod(commands.Cog):
     """
@@ -58,6 +68,14 @@ class AutoMod(commands.Cog):
         self._action_cooldowns: dict[str, datetime] = {}
         self._action_cooldown_seconds = 30
         
+        # Users recently checked and found without a permit (the common case)
+        self._no_permit_cache: TTLCache[str, bool] = TTLCache(
+            NO_PERMIT_CACHE_SIZE, NO_PERMIT_CACHE_TTL
+        )
+        self._filter_settings_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            FILTER_SETTINGS_CACHE_SIZE, FILTER_SETTINGS_CACHE_TTL
+        )
+        
         logger.info("AutoMod cog initialized with strike system")
     
     def _is_on_action_cooldown(self, user_id: str) -> bool:
@@ -91,8 +109,14 @@ class AutoMod(commands.Cog):
         # Get or create user in database
         user_data = self.db.get_or_create_user(user_id, username)
         
-        # Check for permit
-        has_permit = self.db.has_valid_permit(user_id)
+        # Check for permit; only negative results are cached, so a granted
+        # permit is never extended past its expiry
+        if self._no_permit_cache.get(user_id):
+            has_permit = False
+        else:
+            has_permit = self.db.has_valid_permit(user_id)
+            if not has_permit:
+                self._no_permit_cache.set(user_id, True)
         
         # Get follow age (estimate based on first_seen)
         first_seen = user_data.get("first_seen")
@@ -109,7 +133,10 @@ class AutoMod(commands.Cog):
             follow_age_days = 0
         
         # Get filter settings for channel
-        filter_settings = self.db.get_filter_settings(channel_name)
+        filter_settings = self._filter_settings_cache.get(channel_name)
+        if filter_settings is None:
+            filter_settings = self.db.get_filter_settings(channel_name)
+            self._filter_settings_cache.set(channel_name, filter_settings)
         
         return {
             "is_subscriber": getattr(author, "is_subscriber", False),
@@ -514,6 +541,7 @@ class AutoMod(commands.Cog):
         user_id = username
         
         self.db.grant_permit(user_id, ctx.author.name, duration_seconds=60)
+        self._no_permit_cache.clear()
         await ctx.send(f"@{username} You have 60 seconds to post a link.")
         logger.info("%s granted permit by %s", username, ctx.author.name)
     
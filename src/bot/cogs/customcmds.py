@@ -11,15 +11,16 @@ Allows creation and management of custom chat commands with:
 
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone, timedelta
 from typing import TYPE_CHECKING, Optional, Any
 
 from twitchio.ext import commands
 from twitchio.ext.commands import Context
 
+from bot.utils.cache import TTLCache
 from bot.utils.database import get_database, DatabaseManager
 from bot.utils.logging import get_logger
+from bot.utils.serialization import json_loads
 from bot.utils.permissions import is_owner, is_moderator
 from bot.utils.variables import get_variable_parser, VariableParser, VARIABLE_DOCS
 
@@ -30,6 +31,10 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+# Command lookups are cached briefly; the dashboard can edit commands too
+COMMAND_CACHE_TTL = 10  # seconds
+COMMAND_CACHE_SIZE = 512
+
 # Permission levels in order
 PERMISSION_LEVELS = ['everyone', 'follower', 'subscriber', 'vip', 'moderator', 'owner']
 
@@ -68,8 +73,21 @@ class CustomCommands(commands.Cog):
         # Cooldown tracking: {command_name: {user_id: last_use, '_global': last_use}}
         self._cooldowns: dict[str, dict[str, datetime]] = {}
         
+        # Lookup cache: {name_or_alias: command row, or {} if there is none}
+        self._command_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            COMMAND_CACHE_SIZE, COMMAND_CACHE_TTL
+        )
+        
         logger.info("CustomCommands cog initialized")
     
+    def _get_cached_command(self, name: str) -> Optional[dict[str, Any]]:
+        """Look up a command by name or alias, caching misses as well as hits."""
+        cmd = self._command_cache.get(name)
+        if cmd is None:
+            cmd = self.db.get_command(name) or {}
+            self._command_cache.set(name, cmd)
+        return cmd or None
+    
     def _check_permission(
         self,
         required_level: str,
@@ -159,7 +177,7 @@ class CustomCommands(commands.Cog):
         args = parts[1].split() if len(parts) > 1 else []
         
         # Check if its a custom command
-        cmd = self.db.get_command(cmd_name)
+        cmd = self._get_cached_command(cmd_name)
         if not cmd:
             return
         
@@ -208,6 +226,7 @@ class CustomCommands(commands.Cog):
         
         # Update usage and cooldown
         self.db.increment_command_usage(cmd['name'])
+        cmd['use_count'] = cmd.get('use_count', 0) + 1  # Keep the cached row's count current
         self._update_cooldown(cmd['name'], user_id)
         
         logger.debug("Custom command %s used by %s", cmd['name'], username)
@@ -246,6 +265,7 @@ class CustomCommands(commands.Cog):
             return
         
         try:
+            self._command_cache.clear()
             self.db.create_command(
                 name=name,
                 response=response,
@@ -276,6 +296,7 @@ class CustomCommands(commands.Cog):
             await ctx.send(f"@{ctx.author.name} Command !{name} does not exist.")
             return
         
+        self._command_cache.clear()
         self.db.update_command(name, response=response)
         await ctx.send(f"@{ctx.author.name} Command !{name} updated!")
         logger.info("Command !%s edited by %s", name, ctx.author.name)
@@ -294,6 +315,7 @@ class CustomCommands(commands.Cog):
         
         name = name.lower().lstrip("!")
         
+        self._command_cache.clear()
         if self.db.delete_command(name):
             await ctx.send(f"@{ctx.author.name} Command !{name} deleted.")
             logger.info("Command !%s deleted by %s", name, ctx.author.name)
@@ -326,7 +348,7 @@ class CustomCommands(commands.Cog):
         enabled = "Yes" if cmd.get('enabled', True) else "No"
         
         aliases_json = cmd.get('aliases')
-        aliases = json.loads(aliases_json) if aliases_json else []
+        aliases = json_loads(aliases_json) if aliases_json else []
         alias_str = f" | Aliases: {', '.join(aliases)}" if aliases else ""
         
         await ctx.send(
@@ -357,6 +379,7 @@ class CustomCommands(commands.Cog):
             await ctx.send(f"@{ctx.author.name} Invalid level. Use: {', '.join(PERMISSION_LEVELS)}")
             return
         
+        self._command_cache.clear()
         if self.db.update_command(name, permission_level=level):
             await ctx.send(f"@{ctx.author.name} !{name} permission set to {level}")
         else:
@@ -383,6 +406,7 @@ class CustomCommands(commands.Cog):
             await ctx.send(f"@{ctx.author.name} Cooldowns must be numbers (seconds)")
             return
         
+        self._command_cache.clear()
         if self.db.update_command(name, cooldown_user=user_cd_int, cooldown_global=global_cd_int):
             await ctx.send(f"@{ctx.author.name} !{name} cooldown set to {user_cd_int}s user, {global_cd_int}s global")
         else:
@@ -420,6 +444,7 @@ class CustomCommands(commands.Cog):
                 await ctx.send(f"@{ctx.author.name} Alias '{alias}' is already used by command '!{existing['name']}'")
                 return
         
+        self._command_cache.clear()
         if self.db.update_command(name, aliases=alias_list):
             if alias_list:
                 await ctx.send(f"@{ctx.author.name} !{name} aliases: {', '.join(alias_list)}")
@@ -458,6 +483,7 @@ class CustomCommands(commands.Cog):
         
         new_state = not cmd.get('enabled', True)
         
+        self._command_cache.clear()
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
@@ -5,12 +5,13 @@ Watches a JSON queue file AND database command queue for messages from the dashb
 
 import json
 import asyncio
-import sqlite3
 from pathlib import Path
 from twitchio.ext import commands
 
+from bot.utils.database import get_database, DatabaseManager
+from bot.utils.serialization import json_loads
+
 QUEUE_FILE = Path("/opt/twitch-bot/data/dashboard_queue.json")
-DB_PATH = Path("/opt/twitch-bot/data/automod.db")
 
 # Security: Whitelist of allowed dashboard commands
 ALLOWED_DASHBOARD_COMMANDS = {'shoutout', 'so', 'message', 'announce'}
@@ -21,6 +22,7 @@ class DashboardBridge(commands.Cog):
     
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.db: DatabaseManager = get_database()
         self._running = False
         self._task = None
         self._db_task = None
@@ -71,7 +73,7 @@ class DashboardBridge(commands.Cog):
             content = QUEUE_FILE.read_text().strip()
             if not content:
                 return
-            messages = json.loads(content)
+            messages = json_loads(content)
         except (json.JSONDecodeError, IOError):
             return
         
@@ -101,32 +103,29 @@ class DashboardBridge(commands.Cog):
     
     async def _process_db_queue(self):
         """Process commands in the database queue."""
-        if not DB_PATH.exists():
-            return
-        
         try:
-            conn = sqlite3.connect(str(DB_PATH))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Check if table exists
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name='bot_command_queue'
-            """)
-            if not cursor.fetchone():
-                conn.close()
-                return
-            
-            # Get unprocessed commands
-            cursor.execute("""
-                SELECT id, channel, command, args 
-                FROM bot_command_queue 
-                WHERE processed = 0
-                ORDER BY created_at ASC
-                LIMIT 10
-            """)
-            commands_to_process = cursor.fetchall()
+            # Read the batch on the shared connection, then release it before
+            # awaiting: other cogs use the same connection while we send
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Check if table exists
+                cursor.execute("""
+                    SELECT name FROM sqlite_master 
+                    WHERE type='table' AND name='bot_command_queue'
+                """)
+                if not cursor.fetchone():
+                    return
+                
+                # Get unprocessed commands
+                cursor.execute("""
+                    SELECT id, channel, command, args 
+                    FROM bot_command_queue 
+                    WHERE processed = 0
+                    ORDER BY created_at ASC
+                    LIMIT 10
+                """)
+                commands_to_process = cursor.fetchall()
             
             for cmd in commands_to_process:
                 cmd_id = cmd["id"]
@@ -138,19 +137,17 @@ class DashboardBridge(commands.Cog):
                 success = await self._execute_command(channel_name, command, args)
                 
                 # Mark as processed
-                cursor.execute(
-                    "UPDATE bot_command_queue SET processed = 1 WHERE id = ?",
-                    (cmd_id,)
-                )
-                conn.commit()
+                with self.db.get_connection() as conn:
+                    conn.execute(
+                        "UPDATE bot_command_queue SET processed = 1 WHERE id = ?",
+                        (cmd_id,)
+                    )
                 
                 if success:
                     print(f"[DashboardBridge] Executed {command} for {args} in {channel_name}")
                 else:
                     print(f"[DashboardBridge] Failed to execute {command} in {channel_name}")
             
-            conn.close()
-            
         except Exception as e:
             print(f"[DashboardBridge] DB Error: {e}")
     
@@ -219,19 +216,20 @@ class DashboardBridge(commands.Cog):
         if shoutout_cog:
             try:
                 # Get last game from Twitch API
+                channel_name = channel.name.lower()
                 last_game = await shoutout_cog._get_last_game(username)
-                settings = shoutout_cog._get_shoutout_settings(channel.name)
+                settings = shoutout_cog._get_shoutout_settings(channel_name)
                 
                 # Parse the message template
                 message = shoutout_cog._parse_shoutout_variables(
                     settings.message,
                     user=display_name,
                     game=last_game,
-                    channel=channel.name,
+                    channel=channel_name,
                 )
                 
                 # Update cooldown
-                shoutout_cog._update_shoutout_cooldown(channel.name, username)
+                shoutout_cog._update_shoutout_cooldown(channel_name, username)
             except Exception as e:
                 print(f"[DashboardBridge] Shoutout cog error: {e}")
                 message = f"Go check out @{display_name} at twitch.tv/{username}! 💜"
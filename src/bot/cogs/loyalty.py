@@ -17,10 +17,19 @@ from typing import TYPE_CHECKING, Optional, Any
 from twitchio.ext import commands
 from twitchio.ext.commands import Context
 
+from bot.utils.cache import TTLCache
 from bot.utils.database import get_database, DatabaseManager
 
 # Points cap to prevent integer overflow
 MAX_POINTS = 100_000_000  # 100 million cap
+
+# Chat message points are accumulated per user and written in batches
+MESSAGE_POINTS_FLUSH_INTERVAL = 2.0  # seconds
+
+# Settings are read on every chat message but can also be changed from the
+# dashboard, so cached copies expire
+SETTINGS_CACHE_TTL = 60  # seconds
+SETTINGS_CACHE_SIZE = 256
 from bot.utils.logging import get_logger
 from bot.utils.permissions import is_owner, is_moderator
 
@@ -47,19 +56,44 @@ class Loyalty(commands.Cog):
         """Initialize the loyalty cog."""
         self.bot = bot
         self.db: DatabaseManager = get_database()
+        self._settings_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            SETTINGS_CACHE_SIZE, SETTINGS_CACHE_TTL
+        )
         
         # Track active chatters for watch time points
         self._active_chatters: dict[str, set[str]] = {}  # {channel: {user_id, ...}}
         self._last_point_award: datetime = datetime.now(timezone.utc)
         
+        # Message points not yet written: {(channel, user_id): (username, points, messages)}
+        self._pending_message_points: dict[tuple[str, str], tuple[str, float, int]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        
         # Points task
         self._points_task: Optional[asyncio.Task] = None
         self._running = False
         
         logger.info("Loyalty cog initialized")
 
+    def _get_settings(self, channel: str) -> dict[str, Any]:
+        """
+        Get loyalty settings for a channel, cached.
+        
+        The returned dict is shared with the settings cache and must not
+        be modified; use update_loyalty_settings instead.
+        """
+        channel = channel.lower()
+        cached = self._settings_cache.get(channel)
+        if cached is not None:
+            return cached
+        
+        settings = self.db.get_loyalty_settings(channel)
+        self._settings_cache.set(channel, settings)
+        return settings
+    
     def _add_points_capped(self, user_id: str, username: str, channel: str, points_delta: float, **kwargs) -> None:
         """Add points with cap enforcement."""
+        self._flush_message_points()
+        
         # Get current points to check cap
         current = self.db.get_user_loyalty(user_id, channel)
         current_points = current.get("points", 0)
@@ -83,12 +117,14 @@ class Loyalty(commands.Cog):
         """Set points with cap enforcement."""
         # Clamp to valid range
         points = max(0, min(MAX_POINTS, points))
+        self._flush_message_points()
         self.db.set_user_points(user_id, channel, points)
     
     async def cog_load(self) -> None:
         """Called when cog is loaded."""
         self._running = True
         self._points_task = asyncio.create_task(self._points_loop())
+        self._flush_task = asyncio.create_task(self._message_points_flush_loop())
         logger.info("Loyalty points loop started")
     
     async def cog_unload(self) -> None:
@@ -100,6 +136,13 @@ class Loyalty(commands.Cog):
                 await self._points_task
             except asyncio.CancelledError:
                 pass
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_message_points()
         logger.info("Loyalty points loop stopped")
     
     async def _points_loop(self) -> None:
@@ -115,13 +158,38 @@ class Loyalty(commands.Cog):
             # Award points every minute
             await asyncio.sleep(60)
     
+    async def _message_points_flush_loop(self) -> None:
+        """Periodically write buffered message points to the database."""
+        while True:
+            await asyncio.sleep(MESSAGE_POINTS_FLUSH_INTERVAL)
+            try:
+                self._flush_message_points()
+            except Exception as e:
+                logger.error("Error flushing message points: %s", e)
+    
+    def _flush_message_points(self) -> None:
+        """Write all buffered message points in a single transaction."""
+        if not self._pending_message_points:
+            return
+        
+        pending = self._pending_message_points
+        self.db.award_message_points(
+            [
+                (user_id, username, channel, points, messages)
+                for (channel, user_id), (username, points, messages) in pending.items()
+            ],
+            MAX_POINTS
+        )
+        # Swap only after the write succeeds so a failed flush is retried
+        self._pending_message_points = {}
+    
     async def _award_watch_points(self) -> None:
         """Award watch time points to active chatters."""
         for channel in self.bot.connected_channels:
             channel_name = channel.name
             
             # Check if loyalty is enabled for this channel
-            settings = self.db.get_loyalty_settings(channel_name)
+            settings = self._get_settings(channel_name)
             if not settings.get("enabled", False):
                 continue
             
@@ -130,15 +198,9 @@ class Loyalty(commands.Cog):
             # Get active chatters for this channel
             active = self._active_chatters.get(channel_name, set())
             
-            for user_id in active:
-                # Award points (we don't have sub/vip info here, so base rate)
-                self._add_points_capped(
-                    user_id=user_id,
-                    username="",  # Will be updated on next message
-                    channel=channel_name,
-                    points_delta=points_per_minute,
-                    watch_time_delta=1
-                )
+            # Award points in one batch (we don't have sub/vip info here, so base rate)
+            if active:
+                self.db.award_watch_time(channel_name, active, points_per_minute, MAX_POINTS)
             
             # Clear active chatters for next minute
             self._active_chatters[channel_name] = set()
@@ -154,7 +216,7 @@ class Loyalty(commands.Cog):
         username = message.author.name
         
         # Check if loyalty is enabled
-        settings = self.db.get_loyalty_settings(channel_name)
+        settings = self._get_settings(channel_name)
         if not settings.get("enabled", False):
             return
         
@@ -177,18 +239,17 @@ class Loyalty(commands.Cog):
             multiplier = settings.get("bonus_vip_multiplier", 1.5)
         
         points = points_per_message * multiplier
+        if points == 0:
+            return
         
-        self._add_points_capped(
-            user_id=user_id,
-            username=username,
-            channel=channel_name,
-            points_delta=points,
-            message_count_delta=1
-        )
+        # Buffered; _flush_message_points applies the cap when writing
+        key = (channel_name, user_id)
+        _, pending_points, pending_messages = self._pending_message_points.get(key, ("", 0.0, 0))
+        self._pending_message_points[key] = (username, pending_points + points, pending_messages + 1)
     
     def _get_points_name(self, channel: str) -> str:
         """Get the custom points name for a channel."""
-        settings = self.db.get_loyalty_settings(channel)
+        settings = self._get_settings(channel)
         return settings.get("points_name", "points")
     
     @commands.command(name="points", aliases=["balance", "coins"])
@@ -197,7 +258,7 @@ class Loyalty(commands.Cog):
         channel_name = ctx.channel.name
         
         # Check if loyalty is enabled
-        settings = self.db.get_loyalty_settings(channel_name)
+        settings = self._get_settings(channel_name)
         if not settings.get("enabled", False):
             await ctx.send(f"@{ctx.author.name} Loyalty points are not enabled.")
             return
@@ -213,6 +274,7 @@ class Loyalty(commands.Cog):
             target_name = ctx.author.name
             target_id = str(ctx.author.id)
         
+        self._flush_message_points()
         loyalty = self.db.get_user_loyalty(target_id, channel_name)
         points = int(loyalty.get("points", 0))
         watch_time = loyalty.get("watch_time_minutes", 0)
@@ -232,7 +294,7 @@ class Loyalty(commands.Cog):
         """Check your watch time. Usage: !watchtime [@user]"""
         channel_name = ctx.channel.name
         
-        settings = self.db.get_loyalty_settings(channel_name)
+        settings = self._get_settings(channel_name)
         if not settings.get("enabled", False):
             await ctx.send(f"@{ctx.author.name} Loyalty system is not enabled.")
             return
@@ -262,7 +324,7 @@ class Loyalty(commands.Cog):
         """Show the points leaderboard. Usage: !top [count]"""
         channel_name = ctx.channel.name
         
-        settings = self.db.get_loyalty_settings(channel_name)
+        settings = self._get_settings(channel_name)
         if not settings.get("enabled", False):
             await ctx.send(f"@{ctx.author.name} Loyalty points are not enabled.")
             return
@@ -273,6 +335,7 @@ class Loyalty(commands.Cog):
             limit = 5
         
         points_name = settings.get("points_name", "points")
+        self._flush_message_points()
         leaders = self.db.get_loyalty_leaderboard(channel_name, limit)
         
         if not leaders:
@@ -298,14 +361,16 @@ class Loyalty(commands.Cog):
         
         if action == "on":
             self.db.update_loyalty_settings(channel_name, enabled=True)
+            self._settings_cache.pop(channel_name.lower())
             await ctx.send(f"@{ctx.author.name} Loyalty points system ENABLED!")
             logger.info("Loyalty enabled for %s by %s", channel_name, ctx.author.name)
         elif action == "off":
             self.db.update_loyalty_settings(channel_name, enabled=False)
+            self._settings_cache.pop(channel_name.lower())
             await ctx.send(f"@{ctx.author.name} Loyalty points system DISABLED.")
             logger.info("Loyalty disabled for %s by %s", channel_name, ctx.author.name)
         else:
-            settings = self.db.get_loyalty_settings(channel_name)
+            settings = self._get_settings(channel_name)
             status = "ENABLED" if settings.get("enabled", False) else "DISABLED"
             points_name = settings.get("points_name", "points")
             ppm = settings.get("points_per_minute", 1.0)
@@ -322,6 +387,7 @@ class Loyalty(commands.Cog):
         
         channel_name = ctx.channel.name
         self.db.update_loyalty_settings(channel_name, points_name=name)
+        self._settings_cache.pop(channel_name.lower())
         await ctx.send(f"@{ctx.author.name} Points are now called '{name}'")
     
     @commands.command(name="setpointsrate")
@@ -341,6 +407,7 @@ class Loyalty(commands.Cog):
         
         channel_name = ctx.channel.name
         self.db.update_loyalty_settings(channel_name, points_per_minute=ppm, points_per_message=ppmsg)
+        self._settings_cache.pop(channel_name.lower())
         await ctx.send(f"@{ctx.author.name} Points rate: {ppm}/min, {ppmsg}/msg")
     
     @commands.command(name="givepoints")
@@ -352,7 +419,7 @@ class Loyalty(commands.Cog):
             return
         
         channel_name = ctx.channel.name
-        settings = self.db.get_loyalty_settings(channel_name)
+        settings = self._get_settings(channel_name)
         if not settings.get("enabled", False):
             await ctx.send(f"@{ctx.author.name} Loyalty points are not enabled.")
             return
@@ -386,7 +453,7 @@ class Loyalty(commands.Cog):
             return
         
         channel_name = ctx.channel.name
-        settings = self.db.get_loyalty_settings(channel_name)
+        settings = self._get_settings(channel_name)
         if not settings.get("enabled", False):
             await ctx.send(f"@{ctx.author.name} Loyalty points are not enabled.")
             return
@@ -11,8 +11,10 @@ Provides mass moderation capabilities with safety features:
 
 from __future__ import annotations
 
+import asyncio
 import os
 import re
+import time
 from datetime import datetime, timezone, timedelta
 from typing import TYPE_CHECKING, Optional, Any
 
@@ -34,6 +36,12 @@ logger = get_logger(__name__)
 MAX_REGEX_LENGTH = 100
 REGEX_TIMEOUT = 1.0
 
+# Chat lines are buffered and written to recent_messages in batches
+RECENT_MESSAGE_FLUSH_INTERVAL = 2.0  # seconds
+RECENT_MESSAGE_FLUSH_THRESHOLD = 100  # rows
+# Messages older than the retention window are pruned on this cadence
+RECENT_MESSAGE_CLEANUP_INTERVAL = 30.0  # seconds
+
 
 def is_safe_regex(pattern: str) -> tuple[bool, str]:
     """Validate regex pattern for potential ReDoS vulnerabilities."""
@@ -180,8 +188,52 @@ class Nuke(commands.Cog):
         self.db: DatabaseManager = get_database()
         self.manager = NukeManager(self.db)
         
+        # Messages not yet written to recent_messages
+        self._pending_messages: list[tuple[int, str, str, str, str, bool, bool, bool]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        
         logger.info("Nuke cog initialized")
     
+    async def cog_load(self) -> None:
+        """Called when cog is loaded."""
+        self._flush_task = asyncio.create_task(self._message_flush_loop())
+    
+    async def cog_unload(self) -> None:
+        """Called when cog is unloaded."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_recent_messages()
+    
+    async def _message_flush_loop(self) -> None:
+        """Periodically write buffered chat messages and prune old ones."""
+        last_cleanup = time.monotonic()
+        while True:
+            await asyncio.sleep(RECENT_MESSAGE_FLUSH_INTERVAL)
+            try:
+                self._flush_recent_messages()
+                if time.monotonic() - last_cleanup >= RECENT_MESSAGE_CLEANUP_INTERVAL:
+                    self.db.cleanup_recent_messages()
+                    last_cleanup = time.monotonic()
+            except Exception as e:
+                logger.error("Error flushing recent messages: %s", e)
+    
+    def _flush_recent_messages(self) -> None:
+        """Write all buffered messages in a single transaction."""
+        if not self._pending_messages:
+            return
+        
+        rows, self._pending_messages = self._pending_messages, []
+        try:
+            self.db.add_recent_messages(rows)
+        except Exception:
+            # Keep the rows so the next flush retries them and !nuke can still match them
+            self._pending_messages[:0] = rows
+            raise
+    
     @commands.Cog.event()
     async def event_message(self, message: Message) -> None:
         """Cache recent messages for nuke command."""
@@ -192,15 +244,22 @@ class Nuke(commands.Cog):
         if getattr(message.author, "is_mod", False):
             return
         
-        self.db.add_recent_message(
-            channel=message.channel.name,
-            user_id=str(message.author.id),
-            username=message.author.name,
-            message=message.content,
-            is_subscriber=getattr(message.author, "is_subscriber", False),
-            is_vip=getattr(message.author, "is_vip", False),
-            is_mod=getattr(message.author, "is_mod", False)
-        )
+        # Stamp on receipt so batching doesn't shift the nuke lookback window
+        self._pending_messages.append((
+            int(time.time()),
+            message.channel.name.lower(),
+            str(message.author.id),
+            message.author.name,
+            message.content,
+            getattr(message.author, "is_subscriber", False),
+            getattr(message.author, "is_vip", False),
+            False,
+        ))
+        if len(self._pending_messages) >= RECENT_MESSAGE_FLUSH_THRESHOLD:
+            try:
+                self._flush_recent_messages()
+            except Exception as e:
+                logger.error("Error flushing recent messages: %s", e)
     
     @commands.command(name="nuke")
     @is_moderator()
@@ -242,6 +301,9 @@ class Nuke(commands.Cog):
             await ctx.send(f"@{ctx.author.name} Please provide a pattern in quotes")
             return
         
+        # Make sure the latest chat lines are searchable
+        self._flush_recent_messages()
+        
         # Find matches
         matches, error = self.manager.find_matches(
             channel=channel_name,
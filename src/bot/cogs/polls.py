@@ -12,7 +12,6 @@ Provides both native Twitch Polls API integration and chat-based polling:
 from __future__ import annotations
 
 import asyncio
-import json
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
@@ -21,6 +20,7 @@ from twitchio.ext.commands import Context
 
 from bot.utils.database import get_database, DatabaseManager
 from bot.utils.logging import get_logger
+from bot.utils.serialization import json_dumps, json_loads
 from bot.utils.permissions import is_moderator
 
 if TYPE_CHECKING:
@@ -234,7 +234,7 @@ class Polls(commands.Cog):
             del self._active_polls[channel_name]
         
         # Build results message
-        options = json.loads(poll["options"])
+        options = json_loads(poll["options"])
         total_votes = sum(r["votes"] for r in results)
         
         if total_votes == 0:
@@ -303,7 +303,7 @@ class Polls(commands.Cog):
             """, (
                 channel.lower(),
                 question,
-                json.dumps(options),
+                json_dumps(options),
                 started_by,
                 duration_seconds,
                 poll_type,
@@ -348,7 +348,7 @@ class Polls(commands.Cog):
             if not row:
                 return []
             
-            options = json.loads(row["options"])
+            options = json_loads(row["options"])
             
             # Get vote counts per option
             cursor.execute("""
@@ -647,7 +647,7 @@ class Polls(commands.Cog):
         
         results = self._get_poll_results(poll["id"])
         total_votes = sum(r["votes"] for r in results)
-        options = json.loads(poll["options"])
+        options = json_loads(poll["options"])
         
         if total_votes == 0:
             await ctx.send(
@@ -679,7 +679,7 @@ class Polls(commands.Cog):
             await ctx.send(f"@{ctx.author.name} No active poll.")
             return
         
-        options = json.loads(poll["options"])
+        options = json_loads(poll["options"])
         total_votes = self._get_total_votes(poll["id"])
         
         # Calculate remaining time
@@ -717,7 +717,7 @@ class Polls(commands.Cog):
             return
         
         option_num = int(option)
-        options = json.loads(poll["options"])
+        options = json_loads(poll["options"])
         
         if option_num < 1 or option_num > len(options):
             await ctx.send(
@@ -12,7 +12,6 @@ Provides both native Twitch Predictions (API) and chat-based predictions:
 from __future__ import annotations
 
 import asyncio
-import json
 from datetime import datetime, timezone, timedelta
 from typing import TYPE_CHECKING, Optional, Any
 
@@ -21,6 +20,7 @@ from twitchio.ext.commands import Context
 
 from bot.utils.database import get_database, DatabaseManager
 from bot.utils.logging import get_logger
+from bot.utils.serialization import json_dumps, json_loads
 from bot.utils.permissions import is_moderator, cooldown, CooldownBucket
 
 if TYPE_CHECKING:
@@ -220,7 +220,7 @@ class Predictions(commands.Cog):
             
             if row:
                 result = dict(row)
-                result["outcomes"] = json.loads(result["outcomes"])
+                result["outcomes"] = json_loads(result["outcomes"])
                 return result
             return None
     
@@ -251,7 +251,7 @@ class Predictions(commands.Cog):
             """, (
                 channel.lower(),
                 question,
-                json.dumps(outcomes),
+                json_dumps(outcomes),
                 started_by,
                 prediction_type,
                 twitch_prediction_id,
@@ -395,6 +395,8 @@ class Predictions(commands.Cog):
         channel: str
     ) -> tuple[bool, str]:
         """Place bet with strict transaction isolation to prevent race conditions."""
+        # BEGIN/commit/rollback below own the whole transaction, so this must not nest
+        assert not self.db.in_transaction_block, "_place_bet must not run inside another transaction"
         with self.db.get_connection() as conn:
             # Set exclusive lock for this transaction to prevent race conditions
             conn.execute("BEGIN EXCLUSIVE")
@@ -415,7 +417,7 @@ class Predictions(commands.Cog):
                     conn.rollback()
                     return False, "Betting is closed for this prediction."
                 
-                outcomes = json.loads(prediction["outcomes"])
+                outcomes = json_loads(prediction["outcomes"])
                 if outcome_index < 1 or outcome_index > len(outcomes):
                     conn.rollback()
                     return False, f"Invalid outcome. Choose 1-{len(outcomes)}."
@@ -475,7 +477,7 @@ class Predictions(commands.Cog):
             if not prediction:
                 return {}
             
-            outcomes = json.loads(prediction["outcomes"])
+            outcomes = json_loads(prediction["outcomes"])
             
             # Get bet totals per outcome
             cursor.execute("""
@@ -515,8 +517,15 @@ class Predictions(commands.Cog):
                 "total_bets": total_bets
             }
     
+    def _flush_loyalty_points(self) -> None:
+        """Write the Loyalty cog's buffered message points before reading balances."""
+        loyalty_cog = self.bot.get_cog("Loyalty")
+        if loyalty_cog:
+            loyalty_cog._flush_message_points()
+    
     def _get_user_points(self, user_id: str, channel: str) -> int:
         """Get user's current points."""
+        self._flush_loyalty_points()
         loyalty = self.db.get_user_loyalty(user_id, channel)
         return int(loyalty.get("points", 0))
     
@@ -866,7 +875,7 @@ class Predictions(commands.Cog):
         for pred in history:
             question = pred["question"][:30] + "..." if len(pred["question"]) > 30 else pred["question"]
             if pred["status"] == "resolved":
-                outcomes = json.loads(pred["outcomes"])
+                outcomes = json_loads(pred["outcomes"])
                 winner = outcomes[pred["winning_outcome"]]
                 entries.append(f"✓ {question} → {winner}")
             else:
@@ -943,7 +952,8 @@ class Predictions(commands.Cog):
             await ctx.send(f"@{ctx.author.name} Maximum bet is {max_bet} points.")
             return
         
-        # Place the bet
+        # Place the bet against a balance that includes buffered message points
+        self._flush_loyalty_points()
         success, message = self._place_bet(
             prediction_id=prediction["id"],
             user_id=str(ctx.author.id),
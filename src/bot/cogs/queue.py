@@ -218,7 +218,7 @@ class Queue(commands.Cog):
                 cursor.execute(f"""
                     SELECT id, user_id, username, is_subscriber, joined_at, picked, picked_at
                     FROM viewer_queue
-                    WHERE channel = ? AND queue_name = ? AND picked = FALSE
+                    WHERE channel = ? AND queue_name = ? AND picked = 0
                     ORDER BY {order_by}
                 """, (channel.lower(), queue_name.lower()))
             
@@ -244,7 +244,7 @@ class Queue(commands.Cog):
                 cursor.execute("""
                     SELECT COUNT(*) as count
                     FROM viewer_queue
-                    WHERE channel = ? AND queue_name = ? AND picked = FALSE
+                    WHERE channel = ? AND queue_name = ? AND picked = 0
                 """, (channel.lower(), queue_name.lower()))
             
             return cursor.fetchone()["count"]
@@ -427,7 +427,7 @@ class Queue(commands.Cog):
             cursor = conn.cursor()
             cursor.execute("""
                 UPDATE viewer_queue
-                SET picked = TRUE, picked_at = ?
+                SET picked = 1, picked_at = ?
                 WHERE id = ?
             """, (datetime.now(timezone.utc).isoformat(), entry["id"]))
         
@@ -456,7 +456,7 @@ class Queue(commands.Cog):
             if picked_only:
                 cursor.execute("""
                     DELETE FROM viewer_queue
-                    WHERE channel = ? AND queue_name = ? AND picked = TRUE
+                    WHERE channel = ? AND queue_name = ? AND picked = 1
                 """, (channel.lower(), queue_name.lower()))
             else:
                 cursor.execute("""
@@ -760,11 +760,13 @@ class Queue(commands.Cog):
                 DELETE FROM viewer_queue
                 WHERE channel = ? AND queue_name = ? AND LOWER(username) = ?
             """, (channel.lower(), queue_name.lower(), username_clean))
-            
-            if cursor.rowcount > 0:
-                await ctx.send(f"@{username_clean} removed from viewer queue [{queue_name}].")
-            else:
-                await ctx.send(f"@{username_clean} is not in the viewer queue.")
+            removed = cursor.rowcount
+
+        # Send after the block so the DELETE isn't held open across the await
+        if removed > 0:
+            await ctx.send(f"@{username_clean} removed from viewer queue [{queue_name}].")
+        else:
+            await ctx.send(f"@{username_clean} is not in the viewer queue.")
     
     @commands.command(name="vqclearpicked", aliases=["vclearpicked"])
     @is_moderator()
@@ -14,21 +14,25 @@ Features:
 from __future__ import annotations
 
 import asyncio
+import heapq
 import re
 import time
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, ClassVar, Optional
 
 import aiohttp
 from twitchio.ext import commands
 from twitchio.ext.commands import Context
 
+from bot.utils.cache import TTLCache
 from bot.utils.database import get_database, DatabaseManager
 from bot.utils.logging import get_logger
+from bot.utils.serialization import json_loads
 from bot.utils.permissions import is_moderator, is_owner, cooldown, CooldownBucket
 
 if TYPE_CHECKING:
-    from twitchio import Message
+    from twitchio import Channel, Message, User
     from bot.bot import TwitchBot
 
 logger = get_logger(__name__)
@@ -38,10 +42,157 @@ logger = get_logger(__name__)
 DEFAULT_SHOUTOUT_MESSAGE = "Go check out @$(user) at twitch.tv/$(user) - They were last playing $(game)! 💜"
 DEFAULT_WELCOME_MESSAGE = "Welcome to the stream @$(user)! 👋"
 
+# Helix budget is 800 points/minute per app token; keep some headroom
+HELIX_RATE_LIMIT = 750
+HELIX_RATE_PERIOD = 60.0
+
+# Last-game lookups are cached briefly; streamers rarely switch games mid-raid
+LAST_GAME_CACHE_TTL = 300  # seconds
+LAST_GAME_CACHE_SIZE = 1024
+DEFAULT_GAME = "an awesome game"
+
+# Settings can also be edited from the dashboard; bound how long a cached copy lives
+SETTINGS_CACHE_TTL = 60  # seconds
+SETTINGS_CACHE_SIZE = 256
+
+# New known-chatter rows are buffered and written in batches
+CHATTER_FLUSH_INTERVAL = 2.0  # seconds
+CHATTER_FLUSH_THRESHOLD = 100  # rows
+
+# Statements reused on the shared connection (hits SQLite's statement cache)
+_SQL_GET_SHOUTOUT_SETTINGS = (
+    "SELECT enabled, auto_raid_shoutout, message, cooldown_seconds "
+    "FROM shoutout_settings WHERE channel = ?"
+)
+_SQL_GET_FIRST_CHATTER_SETTINGS = (
+    "SELECT enabled, message FROM first_chatter_settings WHERE channel = ?"
+)
+_SQL_LOG_SHOUTOUT = (
+    "INSERT INTO shoutout_history (channel, target_user, shouted_by, was_raid) "
+    "VALUES (?, ?, ?, ?)"
+)
+_SQL_HISTORY_BY_CHANNEL = """
+    SELECT target_user, shouted_by, shouted_at, was_raid
+    FROM shoutout_history
+    WHERE channel = ?
+    ORDER BY shouted_at DESC
+    LIMIT 5
+"""
+_SQL_HISTORY_BY_TARGET = """
+    SELECT target_user, shouted_by, shouted_at, was_raid
+    FROM shoutout_history
+    WHERE channel = ? AND target_user = ?
+    ORDER BY shouted_at DESC
+    LIMIT 5
+"""
+_SQL_ADD_KNOWN_CHATTER = (
+    "INSERT OR IGNORE INTO known_chatters (channel, user_id, username) "
+    "VALUES (?, ?, ?)"
+)
+
+
+# Variable patterns for each message type, matched case-insensitively
+_SHOUTOUT_VARIABLE_RE = re.compile(r"\$\((user|game|channel)\)", re.IGNORECASE)
+_WELCOME_VARIABLE_RE = re.compile(r"\$\((user)\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=128)
+def _compile_template(template: str, pattern: re.Pattern[str]) -> Callable[[dict[str, str]], str]:
+    """
+    Compile a $(var) message template into a renderer function.
+
+    The template is split once into literal chunks and variable slots, so
+    rendering is a single join with no parsing. Renderers are cached per
+    template string, meaning a channel's message is compiled on first use
+    and reused until it changes.
+
+    Args:
+        template: Message template using $(var) placeholders
+        pattern: Precompiled variable pattern with one capture group for the name
+
+    Returns:
+        Function taking a {var: value} mapping and returning the message
+    """
+    # re.split with a capture group alternates literal, variable, literal, ...
+    pieces = tuple(
+        (True, part.lower()) if i % 2 else (False, part)
+        for i, part in enumerate(pattern.split(template))
+        if part or i % 2
+    )
+
+    def render(values: dict[str, str]) -> str:
+        return "".join([values[part] if is_var else part for is_var, part in pieces])
+
+    return render
+
 
-class ShoutoutSettings:
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Allows bursts up to ``max_rate`` acquisitions, then refills at
+    ``max_rate / time_period`` tokens per second. Used as an async
+    context manager around each outgoing request.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0) -> None:
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._level = 0.0
+        self._last_check = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _leak(self) -> None:
+        """Drain the bucket according to the time elapsed since the last check."""
+        now = time.monotonic()
+        if self._level:
+            elapsed = now - self._last_check
+            self._level = max(self._level - elapsed * self._rate_per_sec, 0.0)
+        self._last_check = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._leak()
+            while self._level + 1 > self.max_rate:
+                await asyncio.sleep((self._level + 1 - self.max_rate) / self._rate_per_sec)
+                self._leak()
+            self._level += 1
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_UNSET = object()
+
+
+class _TrackedSettings:
+    """
+    Base for settings containers that track which fields were changed.
+
+    Subclasses list their persisted columns in ``_fields``; assigning a
+    different value to one of them marks it dirty until the next save.
+    """
+
+    _table: str = ""
+    _fields: tuple[str, ...] = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self._fields and self.__dict__.get(name, _UNSET) != value:
+            self._dirty.add(name)
+        super().__setattr__(name, value)
+
+
+class ShoutoutSettings(_TrackedSettings):
     """Container for channel shoutout settings."""
 
+    _table = "shoutout_settings"
+    _fields = ("enabled", "auto_raid_shoutout", "message", "cooldown_seconds")
+
     def __init__(
         self,
         channel: str,
@@ -50,25 +201,32 @@ class ShoutoutSettings:
         message: str = DEFAULT_SHOUTOUT_MESSAGE,
         cooldown_seconds: int = 300,
     ) -> None:
+        self._dirty: set[str] = set()
         self.channel = channel
         self.enabled = enabled
         self.auto_raid_shoutout = auto_raid_shoutout
         self.message = message
         self.cooldown_seconds = cooldown_seconds
+        self._dirty.clear()
 
 
-class FirstChatterSettings:
+class FirstChatterSettings(_TrackedSettings):
     """Container for first-time chatter settings."""
 
+    _table = "first_chatter_settings"
+    _fields = ("enabled", "message")
+
     def __init__(
         self,
         channel: str,
         enabled: bool = True,
         message: str = DEFAULT_WELCOME_MESSAGE,
     ) -> None:
+        self._dirty: set[str] = set()
         self.channel = channel
         self.enabled = enabled
         self.message = message
+        self._dirty.clear()
 
 
 class ShoutoutCog(commands.Cog):
@@ -88,21 +246,55 @@ class ShoutoutCog(commands.Cog):
         self.db: DatabaseManager = get_database()
 
         # Cache for settings
-        self._shoutout_settings_cache: dict[str, ShoutoutSettings] = {}
-        self._first_chatter_settings_cache: dict[str, FirstChatterSettings] = {}
+        self._shoutout_settings_cache: TTLCache[str, ShoutoutSettings] = TTLCache(
+            SETTINGS_CACHE_SIZE, SETTINGS_CACHE_TTL
+        )
+        self._first_chatter_settings_cache: TTLCache[str, FirstChatterSettings] = TTLCache(
+            SETTINGS_CACHE_SIZE, SETTINGS_CACHE_TTL
+        )
 
         # Cooldown tracking: {channel: {username: last_shoutout_time}}
         self._shoutout_cooldowns: dict[str, dict[str, float]] = {}
 
+        # Min-heap of (expires_at, channel, username) used to drop stale cooldowns
+        self._cooldown_expiry: list[tuple[float, str, str]] = []
+
         # Track known chatters per channel: {channel: set(user_ids)}
         self._known_chatters: dict[str, set[str]] = {}
 
+        # Known chatters not yet written to the database: [(channel, user_id, username)]
+        self._pending_chatters: list[tuple[str, str, str]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
         # HTTP session for API calls
         self._session: Optional[aiohttp.ClientSession] = None
         
         # API rate limiting - max 5 concurrent API calls to prevent hitting Twitch rate limits
         self._api_semaphore: asyncio.Semaphore = asyncio.Semaphore(5)
 
+        # Sustained rate limit for Helix calls (the semaphore only bounds concurrency)
+        self._helix_limiter = TokenBucket(HELIX_RATE_LIMIT, HELIX_RATE_PERIOD)
+
+        # Cached app access token, reused until shortly before it expires
+        self._app_token: Optional[str] = None
+        self._app_token_expires_at = 0.0
+        self._app_token_lock = asyncio.Lock()
+
+        # LRU cache of last game lookups: {username: game}
+        self._last_game_cache: TTLCache[str, str] = TTLCache(
+            LAST_GAME_CACHE_SIZE, LAST_GAME_CACHE_TTL
+        )
+
+        # In-flight last game lookups, shared by concurrent callers: {username: task}
+        self._in_flight_games: dict[str, asyncio.Task[Optional[str]]] = {}
+
+        # USERNOTICE msg-id -> handler(channel, channel_name, tags)
+        self._usernotice_handlers: dict[
+            str, Callable[[Optional[Channel], str, dict[str, Any]], Awaitable[None]]
+        ] = {
+            "raid": self._handle_raid,
+        }
+
         # Initialize database tables
         self._init_database()
 
@@ -163,49 +355,121 @@ class ShoutoutCog(commands.Cog):
                 ON known_chatters(channel, user_id)
             """)
 
+            # History lookups filter by channel (and optionally target) and
+            # read the newest rows first; index both shapes in that order
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_shoutout_history_channel
-                ON shoutout_history(channel, target_user)
+                CREATE INDEX IF NOT EXISTS idx_shoutout_history_channel_time
+                ON shoutout_history(channel, shouted_at DESC)
             """)
 
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_shoutout_history_channel_user_time
+                ON shoutout_history(channel, target_user, shouted_at DESC)
+            """)
+
+            # Superseded by idx_shoutout_history_channel_user_time
+            cursor.execute("DROP INDEX IF EXISTS idx_shoutout_history_channel")
+
             logger.debug("Shoutout database tables initialized")
 
     async def cog_load(self) -> None:
         """Called when cog is loaded."""
         # Load known chatters from database into memory
         await self._load_known_chatters()
+        self._flush_task = asyncio.create_task(self._chatter_flush_loop())
         logger.info("ShoutoutCog loaded")
 
     async def cog_unload(self) -> None:
         """Called when cog is unloaded."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_known_chatters()
         if self._session and not self._session.closed:
             await self._session.close()
         logger.info("ShoutoutCog unloaded")
 
+    async def _chatter_flush_loop(self) -> None:
+        """Periodically write buffered known chatters to the database."""
+        while True:
+            await asyncio.sleep(CHATTER_FLUSH_INTERVAL)
+            try:
+                self._flush_known_chatters()
+            except Exception as e:
+                logger.error("Error flushing known chatters: %s", e)
+
+    def _flush_known_chatters(self) -> None:
+        """Write all buffered known chatters in a single transaction."""
+        if not self._pending_chatters:
+            return
+
+        # BEGIN IMMEDIATE below must start a fresh transaction, so this must not nest
+        assert not self.db.in_transaction_block, "_flush_known_chatters must not run inside another transaction"
+        rows, self._pending_chatters = self._pending_chatters, []
+        try:
+            with self.db.get_connection() as conn:
+                # Take the write lock up front so the batch can't fail halfway on SQLITE_BUSY
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_SQL_ADD_KNOWN_CHATTER, rows)
+        except Exception:
+            # Keep the rows so the next flush retries them
+            self._pending_chatters[:0] = rows
+            raise
+
     async def _load_known_chatters(self) -> None:
         """Load known chatters from database into memory cache."""
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT channel, user_id FROM known_chatters")
-            rows = cursor.fetchall()
-
-            for row in rows:
-                channel = row["channel"]
-                user_id = row["user_id"]
-                if channel not in self._known_chatters:
-                    self._known_chatters[channel] = set()
-                self._known_chatters[channel].add(user_id)
+        with self.db.get_read_connection() as conn:
+            # Stream rows instead of fetchall() so large channels don't
+            # materialize every Row object before the sets are built
+            cursor = conn.execute("SELECT channel, user_id FROM known_chatters")
+            known = self._known_chatters
+            for channel, user_id in cursor:
+                chatters = known.get(channel)
+                if chatters is None:
+                    chatters = known[channel] = set()
+                chatters.add(user_id)
 
         logger.debug("Loaded %d known chatter records", sum(len(v) for v in self._known_chatters.values()))
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session for API calls."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            # Pooled keep-alive connector so Helix calls reuse TLS connections
+            connector = aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=self.bot.config.api_timeout,
+                connect=3,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
         return self._session
 
     async def _get_app_access_token(self) -> Optional[str]:
-        """Get an app access token for Twitch API calls."""
+        """
+        Get an app access token for Twitch API calls.
+
+        The token is cached until a minute before it expires, and concurrent
+        callers wait on a single refresh instead of each requesting one.
+        """
+        if self._app_token and time.monotonic() < self._app_token_expires_at:
+            return self._app_token
+
+        async with self._app_token_lock:
+            # Another caller may have refreshed it while we waited
+            if self._app_token and time.monotonic() < self._app_token_expires_at:
+                return self._app_token
+            return await self._request_app_access_token()
+
+    async def _request_app_access_token(self) -> Optional[str]:
+        """Request a new app access token from Twitch and cache it."""
         try:
             session = await self._get_session()
             async with session.post(
@@ -217,8 +481,11 @@ class ShoutoutCog(commands.Cog):
                 },
             ) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
-                    return data.get("access_token")
+                    data = await resp.json(loads=json_loads)
+                    self._app_token = data.get("access_token")
+                    expires_in = data.get("expires_in", 3600)
+                    self._app_token_expires_at = time.monotonic() + max(expires_in - 60, 0)
+                    return self._app_token
                 logger.error("Failed to get app token: HTTP %d", resp.status)
                 return None
         except Exception as e:
@@ -226,21 +493,18 @@ class ShoutoutCog(commands.Cog):
             return None
 
     # ==================== Settings Management ====================
+    #
+    # Helpers below expect channel and user names already lower-cased;
+    # commands and event handlers normalize them once on entry.
 
     def _get_shoutout_settings(self, channel: str) -> ShoutoutSettings:
-        """Get shoutout settings for a channel."""
-        channel = channel.lower()
-
-        if channel in self._shoutout_settings_cache:
-            return self._shoutout_settings_cache[channel]
+        """Get shoutout settings for a (lower-cased) channel."""
+        settings = self._shoutout_settings_cache.get(channel)
+        if settings is not None:
+            return settings
 
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM shoutout_settings WHERE channel = ?",
-                (channel,),
-            )
-            row = cursor.fetchone()
+            row = conn.execute(_SQL_GET_SHOUTOUT_SETTINGS, (channel,)).fetchone()
 
             if row:
                 settings = ShoutoutSettings(
@@ -253,49 +517,55 @@ class ShoutoutCog(commands.Cog):
             else:
                 settings = ShoutoutSettings(channel=channel)
 
-            self._shoutout_settings_cache[channel] = settings
+            self._shoutout_settings_cache.set(channel, settings)
             return settings
 
-    def _save_shoutout_settings(self, settings: ShoutoutSettings) -> None:
-        """Save shoutout settings to database."""
+    def _upsert_settings(self, settings: _TrackedSettings) -> bool:
+        """
+        Write changed settings fields with a single UPSERT.
+
+        The row is inserted with every column if it doesn't exist yet;
+        otherwise only the dirty columns are updated, so edits made
+        elsewhere (e.g. the dashboard) to other columns are kept.
+
+        Args:
+            settings: Settings object to persist
+
+        Returns:
+            True if a write was made, False if nothing had changed
+        """
+        if not settings._dirty:
+            return False
+
+        columns = ("channel", *settings._fields)
+        updates = ", ".join(
+            f"{field} = excluded.{field}" for field in settings._fields if field in settings._dirty
+        )
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO shoutout_settings (channel, enabled, auto_raid_shoutout, message, cooldown_seconds)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(channel) DO UPDATE SET
-                    enabled = excluded.enabled,
-                    auto_raid_shoutout = excluded.auto_raid_shoutout,
-                    message = excluded.message,
-                    cooldown_seconds = excluded.cooldown_seconds
-                """,
-                (
-                    settings.channel,
-                    settings.enabled,
-                    settings.auto_raid_shoutout,
-                    settings.message,
-                    settings.cooldown_seconds,
-                ),
+            conn.execute(
+                f"INSERT INTO {settings._table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(channel) DO UPDATE SET {updates}",
+                tuple(getattr(settings, column) for column in columns),
             )
 
-        self._shoutout_settings_cache[settings.channel] = settings
-        logger.debug("Saved shoutout settings for %s", settings.channel)
+        settings._dirty.clear()
+        return True
 
-    def _get_first_chatter_settings(self, channel: str) -> FirstChatterSettings:
-        """Get first-chatter settings for a channel."""
-        channel = channel.lower()
+    def _save_shoutout_settings(self, settings: ShoutoutSettings) -> None:
+        """Save shoutout settings to database."""
+        if self._upsert_settings(settings):
+            logger.debug("Saved shoutout settings for %s", settings.channel)
+        self._shoutout_settings_cache.set(settings.channel, settings)
 
-        if channel in self._first_chatter_settings_cache:
-            return self._first_chatter_settings_cache[channel]
+    def _get_first_chatter_settings(self, channel: str) -> FirstChatterSettings:
+        """Get first-chatter settings for a (lower-cased) channel."""
+        settings = self._first_chatter_settings_cache.get(channel)
+        if settings is not None:
+            return settings
 
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM first_chatter_settings WHERE channel = ?",
-                (channel,),
-            )
-            row = cursor.fetchone()
+            row = conn.execute(_SQL_GET_FIRST_CHATTER_SETTINGS, (channel,)).fetchone()
 
             if row:
                 settings = FirstChatterSettings(
@@ -306,26 +576,14 @@ class ShoutoutCog(commands.Cog):
             else:
                 settings = FirstChatterSettings(channel=channel)
 
-            self._first_chatter_settings_cache[channel] = settings
+            self._first_chatter_settings_cache.set(channel, settings)
             return settings
 
     def _save_first_chatter_settings(self, settings: FirstChatterSettings) -> None:
         """Save first-chatter settings to database."""
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO first_chatter_settings (channel, enabled, message)
-                VALUES (?, ?, ?)
-                ON CONFLICT(channel) DO UPDATE SET
-                    enabled = excluded.enabled,
-                    message = excluded.message
-                """,
-                (settings.channel, settings.enabled, settings.message),
-            )
-
-        self._first_chatter_settings_cache[settings.channel] = settings
-        logger.debug("Saved first-chatter settings for %s", settings.channel)
+        if self._upsert_settings(settings):
+            logger.debug("Saved first-chatter settings for %s", settings.channel)
+        self._first_chatter_settings_cache.set(settings.channel, settings)
 
     # ==================== Cooldown Management ====================
 
@@ -334,21 +592,21 @@ class ShoutoutCog(commands.Cog):
         Check if a shoutout is on cooldown.
 
         Args:
-            channel: Channel name
-            target_user: Target username
+            channel: Lower-cased channel name
+            target_user: Lower-cased target username
 
         Returns:
             Tuple of (is_on_cooldown, remaining_seconds)
         """
-        channel = channel.lower()
-        target_user = target_user.lower()
         settings = self._get_shoutout_settings(channel)
         now = time.time()
+        self._prune_shoutout_cooldowns(now)
 
-        if channel not in self._shoutout_cooldowns:
-            self._shoutout_cooldowns[channel] = {}
+        channel_cooldowns = self._shoutout_cooldowns.get(channel)
+        if not channel_cooldowns:
+            return False, 0
 
-        last_shoutout = self._shoutout_cooldowns[channel].get(target_user, 0)
+        last_shoutout = channel_cooldowns.get(target_user, 0)
         elapsed = now - last_shoutout
 
         if elapsed < settings.cooldown_seconds:
@@ -358,34 +616,103 @@ class ShoutoutCog(commands.Cog):
         return False, 0
 
     def _update_shoutout_cooldown(self, channel: str, target_user: str) -> None:
-        """Update the cooldown timestamp for a shoutout."""
-        channel = channel.lower()
-        target_user = target_user.lower()
+        """Update the cooldown timestamp for a shoutout (lower-cased names)."""
+        now = time.time()
+        self._shoutout_cooldowns.setdefault(channel, {})[target_user] = now
+
+        expires_at = now + self._get_shoutout_settings(channel).cooldown_seconds
+        heapq.heappush(self._cooldown_expiry, (expires_at, channel, target_user))
 
-        if channel not in self._shoutout_cooldowns:
-            self._shoutout_cooldowns[channel] = {}
+    def _prune_shoutout_cooldowns(self, now: float) -> None:
+        """
+        Drop cooldown entries that have expired.
+
+        Pops from the head of the expiry heap, so each call only touches
+        entries that are actually due instead of scanning every cooldown.
+
+        Args:
+            now: Current time.time() value
+        """
+        heap = self._cooldown_expiry
+        while heap and heap[0][0] <= now:
+            _, channel, target_user = heapq.heappop(heap)
+            channel_cooldowns = self._shoutout_cooldowns.get(channel)
+            if not channel_cooldowns or target_user not in channel_cooldowns:
+                continue
+
+            # The cooldown may have been refreshed or lengthened since this entry was pushed
+            expires_at = (
+                channel_cooldowns[target_user]
+                + self._get_shoutout_settings(channel).cooldown_seconds
+            )
+            if expires_at > now:
+                heapq.heappush(heap, (expires_at, channel, target_user))
+                continue
 
-        self._shoutout_cooldowns[channel][target_user] = time.time()
+            del channel_cooldowns[target_user]
+            if not channel_cooldowns:
+                del self._shoutout_cooldowns[channel]
 
     # ==================== Twitch API Helpers ====================
 
-    async def _get_last_game(self, username: str) -> str:
+    async def _fetch_users_limited(self, username: str) -> list[User]:
+        """Look up a user via Helix /users, counted against the Helix rate limit."""
+        async with self._helix_limiter:
+            return await self.bot.fetch_users(names=[username])
+
+    async def _get_last_game(self, username: str, user_id: Optional[str] = None) -> str:
         """
         Get the last game played by a user from Twitch API.
-        
-        Uses semaphore to limit concurrent API calls and prevent rate limiting.
+
+        Successful lookups are cached for LAST_GAME_CACHE_TTL seconds so
+        repeat shoutouts and raid storms don't re-query Helix, and
+        concurrent lookups for the same user share a single request.
 
         Args:
-            username: Twitch username
+            username: Lower-cased Twitch username
+            user_id: The user's Twitch ID, if the caller already has it
 
         Returns:
             Game name or "an awesome game" if not found
         """
+        cached = self._last_game_cache.get(username)
+        if cached is not None:
+            return cached
+
+        # Collapse concurrent lookups for the same user onto one request
+        task = self._in_flight_games.get(username)
+        if task is None:
+            task = asyncio.create_task(self._fetch_last_game(username, user_id))
+            self._in_flight_games[username] = task
+            task.add_done_callback(lambda _: self._in_flight_games.pop(username, None))
+
+        # Shield so one cancelled caller doesn't cancel the lookup for the others
+        game = await asyncio.shield(task)
+        if game is None:
+            return DEFAULT_GAME
+
+        self._last_game_cache.set(username, game)
+        return game
+
+    async def _fetch_last_game(self, username: str, user_id: Optional[str] = None) -> Optional[str]:
+        """
+        Fetch the last game played by a user from the Helix API.
+
+        Uses a semaphore to limit concurrent API calls and a token bucket
+        to keep the sustained request rate under the Helix quota.
+
+        Args:
+            username: Twitch username
+            user_id: The user's Twitch ID; looked up via /users if not given
+
+        Returns:
+            Game name, DEFAULT_GAME if the user has none set, or None on failure
+        """
         async with self._api_semaphore:
             try:
                 token = await self._get_app_access_token()
                 if not token:
-                    return "an awesome game"
+                    return None
 
                 session = await self._get_session()
                 headers = {
@@ -393,40 +720,45 @@ class ShoutoutCog(commands.Cog):
                     "Client-Id": self.bot.config.client_id,
                 }
 
-                # First, get user ID
-                users = await self.bot.fetch_users(names=[username])
-                if not users:
-                    return "an awesome game"
-
-                user_id = str(users[0].id)
+                # First, get user ID unless the caller already resolved it
+                if user_id is None:
+                    users = await self._fetch_users_limited(username)
+                    if not users:
+                        return DEFAULT_GAME
+                    user_id = str(users[0].id)
 
                 # Check if they're currently live
-                async with session.get(
+                async with self._helix_limiter, session.get(
                     "https://api.twitch.tv/helix/streams",
                     headers=headers,
                     params={"user_login": username},
                 ) as resp:
+                    if resp.status == 401:
+                        # Token revoked or expired early; fetch a new one next time
+                        self._app_token = None
+                        return None
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = await resp.json(loads=json_loads)
                         if data.get("data"):
-                            return data["data"][0].get("game_name", "an awesome game")
+                            return data["data"][0].get("game_name", DEFAULT_GAME)
 
                 # If not live, get channel info for last game
-                async with session.get(
+                async with self._helix_limiter, session.get(
                     "https://api.twitch.tv/helix/channels",
                     headers=headers,
                     params={"broadcaster_id": user_id},
                 ) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = await resp.json(loads=json_loads)
                         if data.get("data"):
-                            return data["data"][0].get("game_name", "an awesome game")
+                            return data["data"][0].get("game_name", DEFAULT_GAME)
+                        return DEFAULT_GAME
 
-                return "an awesome game"
+                return None
 
             except Exception as e:
                 logger.error("Error fetching last game for %s: %s", username, e)
-                return "an awesome game"
+                return None
 
     # ==================== Variable Parsing ====================
 
@@ -454,18 +786,8 @@ class ShoutoutCog(commands.Cog):
         Returns:
             Parsed message string
         """
-        result = template
-
-        replacements = {
-            r"\$\(user\)": user,
-            r"\$\(game\)": game,
-            r"\$\(channel\)": channel,
-        }
-
-        for pattern, value in replacements.items():
-            result = re.sub(pattern, value, result, flags=re.IGNORECASE)
-
-        return result
+        render = _compile_template(template, _SHOUTOUT_VARIABLE_RE)
+        return render({"user": user, "game": game, "channel": channel})
 
     def _parse_welcome_variables(self, template: str, user: str) -> str:
         """
@@ -481,9 +803,7 @@ class ShoutoutCog(commands.Cog):
         Returns:
             Parsed message string
         """
-        result = template
-        result = re.sub(r"\$\(user\)", user, result, flags=re.IGNORECASE)
-        return result
+        return _compile_template(template, _WELCOME_VARIABLE_RE)({"user": user})
 
     # ==================== Shoutout History ====================
 
@@ -494,15 +814,11 @@ class ShoutoutCog(commands.Cog):
         shouted_by: str,
         was_raid: bool = False,
     ) -> None:
-        """Log a shoutout to the database."""
+        """Log a shoutout to the database (channel and target_user lower-cased)."""
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO shoutout_history (channel, target_user, shouted_by, was_raid)
-                VALUES (?, ?, ?, ?)
-                """,
-                (channel.lower(), target_user.lower(), shouted_by.lower(), was_raid),
+            conn.execute(
+                _SQL_LOG_SHOUTOUT,
+                (channel, target_user, shouted_by.lower(), was_raid),
             )
 
     # ==================== Watchtime Formatting ====================
@@ -544,7 +860,7 @@ class ShoutoutCog(commands.Cog):
 
         Usage: !so <username> or !shoutout <username>
         """
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         settings = self._get_shoutout_settings(channel_name)
 
         if not settings.enabled:
@@ -567,18 +883,19 @@ class ShoutoutCog(commands.Cog):
             )
             return
 
-        # Fetch last game
-        last_game = await self._get_last_game(target)
-
-        # Get display name
+        # Resolve the user once; the last-game lookup reuses the id
         try:
-            users = await self.bot.fetch_users(names=[target])
-            if users:
-                display_name = users[0].display_name or users[0].name
-            else:
-                display_name = target
-        except Exception:
+            users = await self._fetch_users_limited(target)
+        except Exception as e:
+            logger.error("Error fetching user %s: %s", target, e)
+            users = []
+
+        if users:
+            display_name = users[0].display_name or users[0].name
+            last_game = await self._get_last_game(target, str(users[0].id))
+        else:
             display_name = target
+            last_game = DEFAULT_GAME
 
         # Parse and send message
         message = self._parse_shoutout_variables(
@@ -603,6 +920,77 @@ class ShoutoutCog(commands.Cog):
 
     # ==================== Shoutout Settings Commands ====================
 
+    async def _soset_status(self, ctx: Context, settings: ShoutoutSettings, _value: str) -> None:
+        """Show current shoutout settings."""
+        status = "ENABLED" if settings.enabled else "DISABLED"
+        autoraid = "ON" if settings.auto_raid_shoutout else "OFF"
+        await ctx.send(
+            f"@{ctx.author.name} Shoutouts: {status} | Auto-raid: {autoraid} | "
+            f"Cooldown: {settings.cooldown_seconds}s"
+        )
+
+    async def _soset_on(self, ctx: Context, settings: ShoutoutSettings, _value: str) -> None:
+        """Enable shoutouts."""
+        settings.enabled = True
+        self._save_shoutout_settings(settings)
+        await ctx.send(f"@{ctx.author.name} Shoutouts ENABLED!")
+
+    async def _soset_off(self, ctx: Context, settings: ShoutoutSettings, _value: str) -> None:
+        """Disable shoutouts."""
+        settings.enabled = False
+        self._save_shoutout_settings(settings)
+        await ctx.send(f"@{ctx.author.name} Shoutouts DISABLED.")
+
+    async def _soset_autoraid(self, ctx: Context, settings: ShoutoutSettings, value: str) -> None:
+        """Toggle auto-shoutout on raids."""
+        if value.lower() == "on":
+            settings.auto_raid_shoutout = True
+            self._save_shoutout_settings(settings)
+            await ctx.send(f"@{ctx.author.name} Auto-shoutout on raids ENABLED!")
+        elif value.lower() == "off":
+            settings.auto_raid_shoutout = False
+            self._save_shoutout_settings(settings)
+            await ctx.send(f"@{ctx.author.name} Auto-shoutout on raids DISABLED.")
+        else:
+            await ctx.send(f"@{ctx.author.name} Usage: !soset autoraid on/off")
+
+    async def _soset_message(self, ctx: Context, settings: ShoutoutSettings, value: str) -> None:
+        """Show or set the shoutout message."""
+        if not value:
+            await ctx.send(
+                f"@{ctx.author.name} Current message: {settings.message}"
+            )
+            return
+        settings.message = value
+        self._save_shoutout_settings(settings)
+        _compile_template(value, _SHOUTOUT_VARIABLE_RE)  # compile now, not on the next raid
+        await ctx.send(f"@{ctx.author.name} Shoutout message updated!")
+
+    async def _soset_cooldown(self, ctx: Context, settings: ShoutoutSettings, value: str) -> None:
+        """Set the per-target shoutout cooldown."""
+        try:
+            seconds = int(value)
+            if seconds < 0:
+                raise ValueError("Cooldown must be positive")
+            settings.cooldown_seconds = seconds
+            self._save_shoutout_settings(settings)
+            await ctx.send(f"@{ctx.author.name} Shoutout cooldown set to {seconds} seconds.")
+        except ValueError:
+            await ctx.send(f"@{ctx.author.name} Cooldown must be a positive number.")
+
+    # !soset action -> handler
+    _SOSET_ACTIONS: ClassVar[
+        dict[str, Callable[[ShoutoutCog, Context, ShoutoutSettings, str], Awaitable[None]]]
+    ] = {
+        "": _soset_status,
+        "status": _soset_status,
+        "on": _soset_on,
+        "off": _soset_off,
+        "autoraid": _soset_autoraid,
+        "message": _soset_message,
+        "cooldown": _soset_cooldown,
+    }
+
     @commands.command(name="soset")
     @is_owner()
     async def shoutout_settings(self, ctx: Context, action: str = "", *, value: str = "") -> None:
@@ -616,70 +1004,15 @@ class ShoutoutCog(commands.Cog):
             !soset message <message> - Set shoutout message
             !soset cooldown <seconds> - Set cooldown between shoutouts
         """
-        channel_name = ctx.channel.name
-        settings = self._get_shoutout_settings(channel_name)
-        action = action.lower()
-
-        if action in ("", "status"):
-            status = "ENABLED" if settings.enabled else "DISABLED"
-            autoraid = "ON" if settings.auto_raid_shoutout else "OFF"
+        handler = self._SOSET_ACTIONS.get(action.lower())
+        if handler is None:
             await ctx.send(
-                f"@{ctx.author.name} Shoutouts: {status} | Auto-raid: {autoraid} | "
-                f"Cooldown: {settings.cooldown_seconds}s"
+                f"@{ctx.author.name} Usage: !soset <status/on/off/autoraid/message/cooldown>"
             )
             return
 
-        if action == "on":
-            settings.enabled = True
-            self._save_shoutout_settings(settings)
-            await ctx.send(f"@{ctx.author.name} Shoutouts ENABLED!")
-            return
-
-        if action == "off":
-            settings.enabled = False
-            self._save_shoutout_settings(settings)
-            await ctx.send(f"@{ctx.author.name} Shoutouts DISABLED.")
-            return
-
-        if action == "autoraid":
-            if value.lower() == "on":
-                settings.auto_raid_shoutout = True
-                self._save_shoutout_settings(settings)
-                await ctx.send(f"@{ctx.author.name} Auto-shoutout on raids ENABLED!")
-            elif value.lower() == "off":
-                settings.auto_raid_shoutout = False
-                self._save_shoutout_settings(settings)
-                await ctx.send(f"@{ctx.author.name} Auto-shoutout on raids DISABLED.")
-            else:
-                await ctx.send(f"@{ctx.author.name} Usage: !soset autoraid on/off")
-            return
-
-        if action == "message":
-            if not value:
-                await ctx.send(
-                    f"@{ctx.author.name} Current message: {settings.message}"
-                )
-                return
-            settings.message = value
-            self._save_shoutout_settings(settings)
-            await ctx.send(f"@{ctx.author.name} Shoutout message updated!")
-            return
-
-        if action == "cooldown":
-            try:
-                seconds = int(value)
-                if seconds < 0:
-                    raise ValueError("Cooldown must be positive")
-                settings.cooldown_seconds = seconds
-                self._save_shoutout_settings(settings)
-                await ctx.send(f"@{ctx.author.name} Shoutout cooldown set to {seconds} seconds.")
-            except ValueError:
-                await ctx.send(f"@{ctx.author.name} Cooldown must be a positive number.")
-            return
-
-        await ctx.send(
-            f"@{ctx.author.name} Usage: !soset <status/on/off/autoraid/message/cooldown>"
-        )
+        settings = self._get_shoutout_settings(ctx.channel.name.lower())
+        await handler(self, ctx, settings, value)
 
 # DISABLED - already in loyalty.py:     # ==================== Watchtime Commands ====================
 # DISABLED - already in loyalty.py: 
@@ -758,6 +1091,57 @@ class ShoutoutCog(commands.Cog):
 # DISABLED - already in loyalty.py: 
 # DISABLED - already in loyalty.py:     # ==================== First-time Chatter Commands ====================
 
+    async def _welcomeset_status(
+        self, ctx: Context, settings: FirstChatterSettings, _value: str
+    ) -> None:
+        """Show current welcome settings."""
+        status = "ENABLED" if settings.enabled else "DISABLED"
+        await ctx.send(
+            f"@{ctx.author.name} Welcome messages: {status} | "
+            f"Message: {settings.message}"
+        )
+
+    async def _welcomeset_on(
+        self, ctx: Context, settings: FirstChatterSettings, _value: str
+    ) -> None:
+        """Enable welcome messages."""
+        settings.enabled = True
+        self._save_first_chatter_settings(settings)
+        await ctx.send(f"@{ctx.author.name} Welcome messages ENABLED!")
+
+    async def _welcomeset_off(
+        self, ctx: Context, settings: FirstChatterSettings, _value: str
+    ) -> None:
+        """Disable welcome messages."""
+        settings.enabled = False
+        self._save_first_chatter_settings(settings)
+        await ctx.send(f"@{ctx.author.name} Welcome messages DISABLED.")
+
+    async def _welcomeset_message(
+        self, ctx: Context, settings: FirstChatterSettings, value: str
+    ) -> None:
+        """Show or set the welcome message."""
+        if not value:
+            await ctx.send(
+                f"@{ctx.author.name} Current message: {settings.message}"
+            )
+            return
+        settings.message = value
+        self._save_first_chatter_settings(settings)
+        _compile_template(value, _WELCOME_VARIABLE_RE)  # compile now, not on the next chatter
+        await ctx.send(f"@{ctx.author.name} Welcome message updated!")
+
+    # !welcomeset action -> handler
+    _WELCOMESET_ACTIONS: ClassVar[
+        dict[str, Callable[[ShoutoutCog, Context, FirstChatterSettings, str], Awaitable[None]]]
+    ] = {
+        "": _welcomeset_status,
+        "status": _welcomeset_status,
+        "on": _welcomeset_on,
+        "off": _welcomeset_off,
+        "message": _welcomeset_message,
+    }
+
     @commands.command(name="welcomeset")
     @is_owner()
     async def welcome_settings(self, ctx: Context, action: str = "", *, value: str = "") -> None:
@@ -769,44 +1153,15 @@ class ShoutoutCog(commands.Cog):
             !welcomeset on/off - Enable/disable welcome messages
             !welcomeset message <message> - Set welcome message
         """
-        channel_name = ctx.channel.name
-        settings = self._get_first_chatter_settings(channel_name)
-        action = action.lower()
-
-        if action in ("", "status"):
-            status = "ENABLED" if settings.enabled else "DISABLED"
+        handler = self._WELCOMESET_ACTIONS.get(action.lower())
+        if handler is None:
             await ctx.send(
-                f"@{ctx.author.name} Welcome messages: {status} | "
-                f"Message: {settings.message}"
+                f"@{ctx.author.name} Usage: !welcomeset <status/on/off/message>"
             )
             return
 
-        if action == "on":
-            settings.enabled = True
-            self._save_first_chatter_settings(settings)
-            await ctx.send(f"@{ctx.author.name} Welcome messages ENABLED!")
-            return
-
-        if action == "off":
-            settings.enabled = False
-            self._save_first_chatter_settings(settings)
-            await ctx.send(f"@{ctx.author.name} Welcome messages DISABLED.")
-            return
-
-        if action == "message":
-            if not value:
-                await ctx.send(
-                    f"@{ctx.author.name} Current message: {settings.message}"
-                )
-                return
-            settings.message = value
-            self._save_first_chatter_settings(settings)
-            await ctx.send(f"@{ctx.author.name} Welcome message updated!")
-            return
-
-        await ctx.send(
-            f"@{ctx.author.name} Usage: !welcomeset <status/on/off/message>"
-        )
+        settings = self._get_first_chatter_settings(ctx.channel.name.lower())
+        await handler(self, ctx, settings, value)
 
     # ==================== Event Handlers ====================
 
@@ -816,55 +1171,69 @@ class ShoutoutCog(commands.Cog):
         if message.echo or not message.author or not message.channel:
             return
 
-        channel_name = message.channel.name.lower()
-        user_id = str(message.author.id)
-        username = message.author.name
+        # IRC channel names arrive lower-cased; only allocate if they aren't
+        channel_name = message.channel.name
+        if not channel_name.islower():
+            channel_name = channel_name.lower()
 
         # Check if first-time chatter detection is enabled
         settings = self._get_first_chatter_settings(channel_name)
         if not settings.enabled:
             return
 
-        # Check if user is already known
-        if channel_name not in self._known_chatters:
-            self._known_chatters[channel_name] = set()
-
-        if user_id in self._known_chatters[channel_name]:
+        # Check if user is already known (TwitchIO exposes the id as the raw tag string)
+        user_id = message.author.id
+        if not isinstance(user_id, str):
+            user_id = str(user_id)
+        known = self._known_chatters.setdefault(channel_name, set())
+        if user_id in known:
             return
 
+        username = message.author.name
+
         # New chatter detected - add to known chatters
-        self._known_chatters[channel_name].add(user_id)
+        known.add(user_id)
 
-        # Save to database
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO known_chatters (channel, user_id, username)
-                VALUES (?, ?, ?)
-                """,
-                (channel_name, user_id, username),
-            )
+        # Queue for the next batched database write
+        self._pending_chatters.append((channel_name, user_id, username))
+        if len(self._pending_chatters) >= CHATTER_FLUSH_THRESHOLD:
+            try:
+                self._flush_known_chatters()
+            except Exception as e:
+                logger.error("Error flushing known chatters: %s", e)
 
         # Send welcome message
         welcome_message = self._parse_welcome_variables(settings.message, username)
 
-        channel = self.bot.get_channel(channel_name)
-        if channel:
-            await channel.send(welcome_message)
-            logger.info("Welcomed first-time chatter %s in %s", username, channel_name)
+        # Reply on the message's own channel rather than looking it up again
+        await message.channel.send(welcome_message)
+        logger.info("Welcomed first-time chatter %s in %s", username, channel_name)
 
     @commands.Cog.event()
     async def event_raw_usernotice(self, channel, tags: dict[str, Any]) -> None:
-        """Handle raw usernotice events for raid detection."""
-        msg_id = tags.get("msg-id", "")
-
-        if msg_id != "raid":
+        """Handle raw usernotice events, dispatching on msg-id."""
+        handler = self._usernotice_handlers.get(tags.get("msg-id"))
+        if handler is None:
             return
 
-        channel_name = channel.name if hasattr(channel, "name") else str(channel)
-        channel_name = channel_name.lower()
+        try:
+            channel_name = channel.name
+        except AttributeError:
+            channel_name = str(channel)
+            channel = None
+        if not channel_name.islower():
+            channel_name = channel_name.lower()
+
+        # Only resolve the channel object if TwitchIO didn't hand us one
+        if channel is None:
+            channel = self.bot.get_channel(channel_name)
+
+        await handler(channel, channel_name, tags)
 
+    async def _handle_raid(
+        self, channel: Optional[Channel], channel_name: str, tags: dict[str, Any]
+    ) -> None:
+        """Auto-shoutout an incoming raider."""
         # Check if auto-shoutout on raid is enabled
         settings = self._get_shoutout_settings(channel_name)
         if not settings.enabled or not settings.auto_raid_shoutout:
@@ -872,7 +1241,7 @@ class ShoutoutCog(commands.Cog):
 
         # Get raider info
         raider = tags.get("msg-param-displayName", tags.get("display-name", ""))
-        raider_login = tags.get("msg-param-login", tags.get("login", raider.lower()))
+        raider_login = tags.get("msg-param-login", tags.get("login", raider)).lower()
         viewer_count = tags.get("msg-param-viewerCount", "0")
 
         if not raider:
@@ -888,8 +1257,8 @@ class ShoutoutCog(commands.Cog):
             )
             return
 
-        # Fetch last game
-        last_game = await self._get_last_game(raider_login)
+        # Fetch last game; the raid notice already carries the raider's id
+        last_game = await self._get_last_game(raider_login, tags.get("user-id"))
 
         # Parse and send message
         message = self._parse_shoutout_variables(
@@ -899,10 +1268,8 @@ class ShoutoutCog(commands.Cog):
             channel=channel_name,
         )
 
-        # Get channel object and send
-        channel_obj = self.bot.get_channel(channel_name)
-        if channel_obj:
-            await channel_obj.send(message)
+        if channel:
+            await channel.send(message)
 
             # Update cooldown and log
             self._update_shoutout_cooldown(channel_name, raider_login)
@@ -925,34 +1292,14 @@ class ShoutoutCog(commands.Cog):
 
         Usage: !sohistory or !sohistory <username>
         """
-        channel_name = ctx.channel.name
-
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
+        channel_name = ctx.channel.name.lower()
 
+        with self.db.get_read_connection() as conn:
             if username:
                 target = username.lstrip("@").lower()
-                cursor.execute(
-                    """
-                    SELECT target_user, shouted_by, shouted_at, was_raid
-                    FROM shoutout_history
-                    WHERE channel = ? AND target_user = ?
-                    ORDER BY shouted_at DESC
-                    LIMIT 5
-                    """,
-                    (channel_name, target),
-                )
+                cursor = conn.execute(_SQL_HISTORY_BY_TARGET, (channel_name, target))
             else:
-                cursor.execute(
-                    """
-                    SELECT target_user, shouted_by, shouted_at, was_raid
-                    FROM shoutout_history
-                    WHERE channel = ?
-                    ORDER BY shouted_at DESC
-                    LIMIT 5
-                    """,
-                    (channel_name,),
-                )
+                cursor = conn.execute(_SQL_HISTORY_BY_CHANNEL, (channel_name,))
 
             rows = cursor.fetchall()
 
@@ -960,15 +1307,11 @@ class ShoutoutCog(commands.Cog):
             await ctx.send(f"@{ctx.author.name} No shoutout history found.")
             return
 
-        entries = []
-        for row in rows:
-            target = row["target_user"]
-            by = row["shouted_by"]
-            was_raid = row["was_raid"]
-            raid_tag = " (raid)" if was_raid else ""
-            entries.append(f"{target} by {by}{raid_tag}")
-
-        await ctx.send(f"@{ctx.author.name} Recent shoutouts: " + " | ".join(entries))
+        history = " | ".join(
+            f"{target} by {by}{' (raid)' if was_raid else ''}"
+            for target, by, _shouted_at, was_raid in rows
+        )
+        await ctx.send(f"@{ctx.author.name} Recent shoutouts: {history}")
 
 
 def prepare(bot: TwitchBot) -> None:
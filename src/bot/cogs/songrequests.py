@@ -15,21 +15,23 @@ The bot only manages the queue and settings.
 
 from __future__ import annotations
 
-import json
 import re
-import urllib.error
-import urllib.request
-import urllib.parse
+import string
+from functools import lru_cache
 from typing import TYPE_CHECKING, Optional, Any
 
+import aiohttp
 from twitchio.ext import commands
 from twitchio.ext.commands import Context
 
+from bot.utils.cache import TTLCache
 from bot.utils.database import get_database, DatabaseManager
 from bot.utils.logging import get_logger
 from bot.utils.permissions import is_moderator, is_owner
 
 if TYPE_CHECKING:
+    import sqlite3
+
     from twitchio import Message
     from bot.bot import TwitchBot
 
@@ -38,6 +40,35 @@ logger = get_logger(__name__)
 
 # ==================== YouTube Helper Functions ====================
 
+# All supported URL shapes (watch, youtu.be, embed, v, shorts) in one pass
+_YT_URL_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?v=|embed/|v/|shorts/)|youtu\.be/)([a-zA-Z0-9_-]{11})'
+)
+_YT_ID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+
+OEMBED_URL = "https://www.youtube.com/oembed"
+OEMBED_TIMEOUT = 5
+_OEMBED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+}
+
+# Resolved video info by video ID; only successful lookups are cached so a
+# transient oEmbed failure is retried on the next request
+VIDEO_INFO_CACHE_SIZE = 1024
+VIDEO_INFO_CACHE_TTL = 3600
+_video_info_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+    maxsize=VIDEO_INFO_CACHE_SIZE, ttl=VIDEO_INFO_CACHE_TTL
+)
+
+# Columns the queue commands actually read; rows are returned as sqlite3.Row
+_QUEUE_COLUMNS = "id, video_id, title, duration_seconds, requested_by, requested_by_id, status"
+
+# Settings can also be changed from the dashboard, so cached copies expire
+SETTINGS_CACHE_TTL = 60  # seconds
+SETTINGS_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=512)
 def extract_video_id(query: str) -> Optional[str]:
     """
     Extract YouTube video ID from URL.
@@ -48,19 +79,8 @@ def extract_video_id(query: str) -> Optional[str]:
     Returns:
         Video ID if found, None otherwise
     """
-    patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-        r'youtube\.com/v/([a-zA-Z0-9_-]{11})',
-        r'youtube\.com/shorts/([a-zA-Z0-9_-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, query)
-        if match:
-            return match.group(1)
-    
-    return None
+    match = _YT_URL_RE.search(query)
+    return match.group(1) if match else None
 
 
 def normalize_video_id(url_or_id: str) -> Optional[str]:
@@ -80,20 +100,47 @@ def normalize_video_id(url_or_id: str) -> Optional[str]:
         The 11-character video ID, or None if not found
     """
     # If it looks like just an ID (11 chars, valid characters), return it
-    if re.match(r'^[a-zA-Z0-9_-]{11}$', url_or_id):
+    if len(url_or_id) == 11 and _YT_ID_CHARS.issuperset(url_or_id):
         return url_or_id
     
     # Otherwise extract from URL
     return extract_video_id(url_or_id)
 
 
-def get_youtube_info(query: str) -> Optional[dict[str, Any]]:
+async def _fetch_oembed(session: aiohttp.ClientSession, video_id: str) -> dict[str, Any]:
+    """
+    Fetch oEmbed data for a video.
+    
+    Args:
+        session: HTTP session to issue the request on
+        video_id: 11-character YouTube video ID
+        
+    Returns:
+        Parsed oEmbed JSON
+        
+    Raises:
+        aiohttp.ClientResponseError: On a non-200 response
+    """
+    params = {
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "format": "json",
+    }
+    async with session.get(OEMBED_URL, params=params, headers=_OEMBED_HEADERS) as resp:
+        resp.raise_for_status()
+        # oEmbed is sometimes served as text/html, so skip the content-type check
+        return await resp.json(content_type=None)
+
+
+async def get_youtube_info(
+    session: aiohttp.ClientSession, query: str
+) -> Optional[dict[str, Any]]:
     """
     Get YouTube video info from URL or search query.
     
     Uses oEmbed API (no API key required) for URL lookups.
     
     Args:
+        session: HTTP session to issue the request on
         query: YouTube URL or search query
         
     Returns:
@@ -102,23 +149,23 @@ def get_youtube_info(query: str) -> Optional[dict[str, Any]]:
     video_id = extract_video_id(query)
     
     if video_id:
+        cached = _video_info_cache.get(video_id)
+        if cached is not None:
+            return cached
+        
         # Get video info using oEmbed (no API key needed)
         try:
-            url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-            req = urllib.request.Request(
-                url,
-                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            )
-            with urllib.request.urlopen(req, timeout=5) as response:
-                data = json.loads(response.read().decode())
-                return {
-                    "video_id": video_id,
-                    "title": data.get("title", "Unknown"),
-                    "author_name": data.get("author_name", "Unknown"),
-                    "duration_seconds": 0,  # oEmbed doesn't provide duration
-                }
-        except urllib.error.HTTPError as e:
-            logger.warning("YouTube oEmbed error for %s: %s", video_id, e)
+            data = await _fetch_oembed(session, video_id)
+            info = {
+                "video_id": video_id,
+                "title": data.get("title", "Unknown"),
+                "author_name": data.get("author_name", "Unknown"),
+                "duration_seconds": 0,  # oEmbed doesn't provide duration
+            }
+            _video_info_cache.set(video_id, info)
+            return info
+        except aiohttp.ClientResponseError as e:
+            logger.warning("YouTube oEmbed error for %s: %s", video_id, e.status)
             return None
         except Exception as e:
             logger.error("Error fetching YouTube info: %s", e)
@@ -130,17 +177,26 @@ def get_youtube_info(query: str) -> Optional[dict[str, Any]]:
     return None
 
 
+def shorten_title(title: str, width: int) -> str:
+    """Truncate a title to `width` characters for chat, marking the cut with '...'."""
+    if len(title) <= width:
+        return title
+    return title[:width] + "..."
+
+
+@lru_cache(maxsize=256)
 def format_duration(seconds: int) -> str:
     """Format duration in seconds to MM:SS or HH:MM:SS."""
     if seconds <= 0:
         return "Unknown"
     
+    if seconds < 3600:
+        minutes, secs = divmod(seconds, 60)
+        return f"{minutes}:{secs:02d}"
+    
     hours, remainder = divmod(seconds, 3600)
     minutes, secs = divmod(remainder, 60)
-    
-    if hours > 0:
-        return f"{hours}:{minutes:02d}:{secs:02d}"
-    return f"{minutes}:{secs:02d}"
+    return f"{hours}:{minutes:02d}:{secs:02d}"
 
 
 class SongRequests(commands.Cog):
@@ -159,16 +215,38 @@ class SongRequests(commands.Cog):
         """Initialize the song requests cog."""
         self.bot = bot
         self.db: DatabaseManager = get_database()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._settings_cache: TTLCache[str, dict[str, Any]] = TTLCache(
+            SETTINGS_CACHE_SIZE, SETTINGS_CACHE_TTL
+        )
+        # Blacklisted video IDs per channel
+        self._blacklist_cache: TTLCache[str, set[str]] = TTLCache(
+            SETTINGS_CACHE_SIZE, SETTINGS_CACHE_TTL
+        )
         self._init_sr_tables()
         logger.info("SongRequests cog initialized")
     
+    async def cog_unload(self) -> None:
+        """Called when cog is unloaded."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create HTTP session for oEmbed lookups."""
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=OEMBED_TIMEOUT)
+            self._session = aiohttp.ClientSession(timeout=timeout)
+        return self._session
+    
     def _init_sr_tables(self) -> None:
         """Initialize song request database tables."""
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Song request settings table
-            cursor.execute("""
+            # One transaction for the tables and one for the indexes, with the
+            # column migration in between
+            conn.executescript("""
+                BEGIN;
+                
+                -- Song request settings table
                 CREATE TABLE IF NOT EXISTS songrequest_settings (
                     channel TEXT PRIMARY KEY,
                     enabled BOOLEAN DEFAULT FALSE,
@@ -179,11 +257,9 @@ class SongRequests(commands.Cog):
                     volume INTEGER DEFAULT 50,
                     allow_youtube BOOLEAN DEFAULT TRUE,
                     allow_soundcloud BOOLEAN DEFAULT FALSE
-                )
-            """)
-            
-            # Song queue table
-            cursor.execute("""
+                );
+                
+                -- Song queue table
                 CREATE TABLE IF NOT EXISTS song_queue (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     channel TEXT NOT NULL,
@@ -194,12 +270,11 @@ class SongRequests(commands.Cog):
                     requested_by_id TEXT NOT NULL,
                     requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     status TEXT DEFAULT 'queued',
-                    played_at TIMESTAMP
-                )
-            """)
-            
-            # Song blacklist table
-            cursor.execute("""
+                    played_at TIMESTAMP,
+                    priority INTEGER NOT NULL DEFAULT 0
+                );
+                
+                -- Song blacklist table
                 CREATE TABLE IF NOT EXISTS song_blacklist (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     channel TEXT NOT NULL,
@@ -208,11 +283,9 @@ class SongRequests(commands.Cog):
                     reason TEXT,
                     added_by TEXT,
                     added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Song history table
-            cursor.execute("""
+                );
+                
+                -- Song history table
                 CREATE TABLE IF NOT EXISTS song_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     channel TEXT NOT NULL,
@@ -220,34 +293,68 @@ class SongRequests(commands.Cog):
                     title TEXT NOT NULL,
                     requested_by TEXT NOT NULL,
                     played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                );
+                
+                COMMIT;
             """)
             
-            # Create indexes
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_song_queue_channel_status
-                ON song_queue(channel, status)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_song_blacklist_channel
-                ON song_blacklist(channel)
-            """)
-            cursor.execute("""
+            # Add the priority column to queues created before it existed
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(song_queue)")}
+            if "priority" not in columns:
+                conn.execute(
+                    "ALTER TABLE song_queue ADD COLUMN priority INTEGER NOT NULL DEFAULT 0"
+                )
+            
+            conn.executescript("""
+                BEGIN;
+                
+                -- Create indexes
+                CREATE INDEX IF NOT EXISTS idx_song_queue_channel_status_priority
+                ON song_queue(channel, status, priority DESC, requested_at);
+                CREATE INDEX IF NOT EXISTS idx_song_queue_channel_user_status
+                ON song_queue(channel, requested_by_id, status, requested_at DESC);
+                CREATE INDEX IF NOT EXISTS idx_song_queue_channel_video
+                ON song_queue(channel, video_id);
+                CREATE INDEX IF NOT EXISTS idx_song_blacklist_channel_video
+                ON song_blacklist(channel, video_id);
                 CREATE INDEX IF NOT EXISTS idx_song_history_channel
-                ON song_history(channel)
+                ON song_history(channel);
+                
+                -- Superseded by the composite indexes above
+                DROP INDEX IF EXISTS idx_song_queue_channel_status;
+                DROP INDEX IF EXISTS idx_song_queue_channel_status_time;
+                DROP INDEX IF EXISTS idx_song_blacklist_channel;
+                
+                COMMIT;
             """)
             
             logger.info("Song request tables initialized")
     
     # ==================== Database Methods ====================
+    # Channel names are expected lower-cased; commands normalize once on entry.
     
     def get_sr_settings(self, channel: str) -> dict[str, Any]:
-        """Get song request settings for a channel."""
+        """
+        Get song request settings for a channel.
+        
+        The returned dict is shared with the settings cache and must not
+        be modified; use update_sr_settings instead.
+        """
+        cached = self._settings_cache.get(channel)
+        if cached is not None:
+            return cached
+        
+        settings = self._load_sr_settings(channel)
+        self._settings_cache.set(channel, settings)
+        return settings
+    
+    def _load_sr_settings(self, channel: str) -> dict[str, Any]:
+        """Read song request settings for a channel from the database."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM songrequest_settings WHERE channel = ?",
-                (channel.lower(),)
+                (channel,)
             )
             row = cursor.fetchone()
             
@@ -256,7 +363,7 @@ class SongRequests(commands.Cog):
             
             # Return defaults
             return {
-                "channel": channel.lower(),
+                "channel": channel,
                 "enabled": False,
                 "max_queue_size": 50,
                 "max_duration_seconds": 600,
@@ -269,9 +376,9 @@ class SongRequests(commands.Cog):
     
     def update_sr_settings(self, channel: str, **kwargs: Any) -> None:
         """Update song request settings for a channel."""
+        current = dict(self.get_sr_settings(channel))
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            current = self.get_sr_settings(channel)
             
             # Merge with current settings
             for key, value in kwargs.items():
@@ -296,6 +403,9 @@ class SongRequests(commands.Cog):
                 current["max_duration_seconds"], current["user_limit"], current["sub_limit"],
                 current["volume"], current["allow_youtube"], current["allow_soundcloud"]
             ))
+        
+        # Write through so the next read doesn't go back to the database
+        self._settings_cache.set(current["channel"], current)
     
     def add_to_queue(
         self,
@@ -312,54 +422,141 @@ class SongRequests(commands.Cog):
             cursor.execute("""
                 INSERT INTO song_queue (channel, video_id, title, duration_seconds, requested_by, requested_by_id)
                 VALUES (?, ?, ?, ?, ?, ?)
-            """, (channel.lower(), video_id, title, duration, requested_by, requested_by_id))
+            """, (channel, video_id, title, duration, requested_by, requested_by_id))
             return cursor.lastrowid or 0
     
-    def get_queue(self, channel: str) -> list[dict[str, Any]]:
+    def get_queue(self, channel: str) -> list[sqlite3.Row]:
         """Get all queued songs for a channel."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM song_queue 
+            cursor.execute(f"""
+                SELECT {_QUEUE_COLUMNS} FROM song_queue 
                 WHERE channel = ? AND status IN ('queued', 'playing')
                 ORDER BY 
                     CASE status WHEN 'playing' THEN 0 ELSE 1 END,
-                    requested_at ASC
-            """, (channel.lower(),))
-            return [dict(row) for row in cursor.fetchall()]
+                    priority DESC, requested_at ASC, id ASC
+            """, (channel,))
+            return cursor.fetchall()
+    
+    def get_queue_preview(self, channel: str, limit: int = 5) -> tuple[list[sqlite3.Row], int]:
+        """
+        Get the first songs of the queue and the total queue length.
+        
+        Args:
+            channel: Channel name
+            limit: Number of songs to return
+            
+        Returns:
+            Tuple of (first `limit` songs in get_queue order, total count)
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, title, status FROM song_queue
+                WHERE channel = ? AND status IN ('queued', 'playing')
+                ORDER BY
+                    CASE status WHEN 'playing' THEN 0 ELSE 1 END,
+                    priority DESC, requested_at ASC, id ASC
+                LIMIT ?
+            """, (channel, limit))
+            songs = cursor.fetchall()
+            cursor.execute("""
+                SELECT COUNT(*) FROM song_queue
+                WHERE channel = ? AND status IN ('queued', 'playing')
+            """, (channel,))
+            total = cursor.fetchone()[0]
+            return songs, total
+    
+    def get_queued_song_at(self, channel: str, position: int) -> Optional[sqlite3.Row]:
+        """Get the queued (not playing) song at a 1-indexed position, if any."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, title FROM song_queue
+                WHERE channel = ? AND status = 'queued'
+                ORDER BY priority DESC, requested_at ASC, id ASC
+                LIMIT 1 OFFSET ?
+            """, (channel, position - 1))
+            return cursor.fetchone()
+    
+    def get_queued_count(self, channel: str) -> int:
+        """Get the number of queued (not playing) songs in a channel."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COUNT(*) FROM song_queue WHERE channel = ? AND status = 'queued'
+            """, (channel,))
+            return cursor.fetchone()[0]
     
     def get_queue_position(self, channel: str, song_id: int) -> int:
-        """Get position of a song in the queue (1-indexed)."""
-        queue = self.get_queue(channel)
-        for i, song in enumerate(queue, 1):
-            if song["id"] == song_id:
-                return i
-        return 0
+        """Get position of a song in the queue (1-indexed), or 0 if not queued."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            # Same ordering as get_queue: the playing song first, then
+            # by priority, request time and id
+            cursor.execute("""
+                SELECT COUNT(*) AS position
+                FROM song_queue q,
+                     (SELECT id, status, priority, requested_at FROM song_queue
+                      WHERE id = ? AND channel = ? AND status IN ('queued', 'playing')) t
+                WHERE q.channel = ? AND q.status IN ('queued', 'playing')
+                  AND (
+                      (q.status = 'playing' AND (t.status = 'queued' OR q.id <= t.id))
+                      OR (q.status = 'queued' AND t.status = 'queued'
+                          AND (-q.priority, q.requested_at, q.id)
+                              <= (-t.priority, t.requested_at, t.id))
+                  )
+            """, (song_id, channel, channel))
+            row = cursor.fetchone()
+            return row["position"] if row else 0
     
-    def get_current_song(self, channel: str) -> Optional[dict[str, Any]]:
-        """Get the currently playing song."""
+    def _precheck_request(self, channel: str, user_id: str, video_id: str) -> dict[str, Any]:
+        """
+        Gather the queue state !sr needs to validate a request in a single query.
+        
+        Returns:
+            Dict with queue_size (queued + playing), user_count (user's
+            queued songs) and in_queue
+        """
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT * FROM song_queue 
+                SELECT
+                    COUNT(*) AS queue_size,
+                    COALESCE(SUM(status = 'queued' AND requested_by_id = :user_id), 0) AS user_count,
+                    COALESCE(SUM(video_id = :video_id), 0) > 0 AS in_queue
+                FROM song_queue
+                WHERE channel = :channel AND status IN ('queued', 'playing')
+            """, {"channel": channel, "user_id": user_id, "video_id": video_id})
+            row = cursor.fetchone()
+            return {
+                "queue_size": row["queue_size"],
+                "user_count": row["user_count"],
+                "in_queue": bool(row["in_queue"]),
+            }
+    
+    def get_current_song(self, channel: str) -> Optional[sqlite3.Row]:
+        """Get the currently playing song."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {_QUEUE_COLUMNS} FROM song_queue 
                 WHERE channel = ? AND status = 'playing'
                 LIMIT 1
-            """, (channel.lower(),))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            """, (channel,))
+            return cursor.fetchone()
     
-    def get_next_song(self, channel: str) -> Optional[dict[str, Any]]:
+    def get_next_song(self, channel: str) -> Optional[sqlite3.Row]:
         """Get the next song in queue."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM song_queue 
+            cursor.execute(f"""
+                SELECT {_QUEUE_COLUMNS} FROM song_queue 
                 WHERE channel = ? AND status = 'queued'
-                ORDER BY requested_at ASC
+                ORDER BY priority DESC, requested_at ASC, id ASC
                 LIMIT 1
-            """, (channel.lower(),))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            """, (channel,))
+            return cursor.fetchone()
     
     def mark_song_playing(self, song_id: int) -> None:
         """Mark a song as currently playing."""
@@ -375,22 +572,26 @@ class SongRequests(commands.Cog):
         """Mark a song as played and add to history."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Get song info first
-            cursor.execute("SELECT * FROM song_queue WHERE id = ?", (song_id,))
-            song = cursor.fetchone()
-            
-            if song:
-                # Add to history
-                cursor.execute("""
-                    INSERT INTO song_history (channel, video_id, title, requested_by)
-                    VALUES (?, ?, ?, ?)
-                """, (song["channel"], song["video_id"], song["title"], song["requested_by"]))
-                
-                # Update status
-                cursor.execute("""
-                    UPDATE song_queue SET status = 'played' WHERE id = ?
-                """, (song_id,))
+            # Both writes share the one transaction opened by get_connection
+            cursor.execute("""
+                INSERT INTO song_history (channel, video_id, title, requested_by)
+                SELECT channel, video_id, title, requested_by FROM song_queue WHERE id = ?
+            """, (song_id,))
+            cursor.execute("""
+                UPDATE song_queue SET status = 'played' WHERE id = ?
+            """, (song_id,))
+    
+    def move_song_to_front(self, song_id: int) -> None:
+        """Move a song to the front of the queue by raising its priority above the rest."""
+        with self.db.get_connection() as conn:
+            conn.execute("""
+                UPDATE song_queue
+                SET priority = (
+                    SELECT COALESCE(MAX(q.priority), 0) + 1 FROM song_queue q
+                    WHERE q.channel = song_queue.channel AND q.status = 'queued'
+                )
+                WHERE id = ?
+            """, (song_id,))
     
     def skip_song(self, song_id: int) -> None:
         """Skip a song (mark as skipped)."""
@@ -409,13 +610,35 @@ class SongRequests(commands.Cog):
             """, (song_id,))
             return cursor.rowcount > 0
     
+    def remove_video_from_queue(self, channel: str, video_id: str) -> int:
+        """Remove every queued copy of a video. Returns count removed."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                DELETE FROM song_queue WHERE channel = ? AND video_id = ? AND status = 'queued'
+            """, (channel, video_id))
+            return cursor.rowcount
+    
+    def get_known_title(self, channel: str, video_id: str) -> Optional[str]:
+        """Get the stored title of a video queued or played in this channel, if any."""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT title FROM song_queue WHERE channel = :channel AND video_id = :video_id
+                UNION ALL
+                SELECT title FROM song_history WHERE channel = :channel AND video_id = :video_id
+                LIMIT 1
+            """, {"channel": channel, "video_id": video_id})
+            row = cursor.fetchone()
+            return row["title"] if row else None
+    
     def clear_queue(self, channel: str) -> int:
         """Clear all queued songs for a channel. Returns count removed."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 DELETE FROM song_queue WHERE channel = ? AND status = 'queued'
-            """, (channel.lower(),))
+            """, (channel,))
             return cursor.rowcount
     
     def get_user_queue_count(self, channel: str, user_id: str) -> int:
@@ -425,22 +648,21 @@ class SongRequests(commands.Cog):
             cursor.execute("""
                 SELECT COUNT(*) as count FROM song_queue 
                 WHERE channel = ? AND requested_by_id = ? AND status = 'queued'
-            """, (channel.lower(), user_id))
+            """, (channel, user_id))
             row = cursor.fetchone()
             return row["count"] if row else 0
     
-    def get_user_last_request(self, channel: str, user_id: str) -> Optional[dict[str, Any]]:
+    def get_user_last_request(self, channel: str, user_id: str) -> Optional[sqlite3.Row]:
         """Get user's most recent queued song."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM song_queue 
+            cursor.execute(f"""
+                SELECT {_QUEUE_COLUMNS} FROM song_queue 
                 WHERE channel = ? AND requested_by_id = ? AND status = 'queued'
-                ORDER BY requested_at DESC
+                ORDER BY requested_at DESC, id DESC
                 LIMIT 1
-            """, (channel.lower(), user_id))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+            """, (channel, user_id))
+            return cursor.fetchone()
     
     def is_song_blacklisted(self, channel: str, video_id: str) -> bool:
         """Check if a song is blacklisted.
@@ -453,13 +675,25 @@ class SongRequests(commands.Cog):
         if not normalized_id:
             return False
         
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 1 FROM song_blacklist 
-                WHERE channel = ? AND video_id = ?
-            """, (channel.lower(), normalized_id))
-            return cursor.fetchone() is not None
+        return self._is_song_blacklisted_raw(channel, normalized_id)
+    
+    def _is_song_blacklisted_raw(self, channel: str, video_id: str) -> bool:
+        """Check an already-extracted 11-character video ID against the blacklist."""
+        return video_id in self._get_blacklist(channel)
+    
+    def _get_blacklist(self, channel: str) -> set[str]:
+        """Get the set of blacklisted video IDs for a channel, loading it on a miss."""
+        blacklist = self._blacklist_cache.get(channel)
+        if blacklist is None:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT video_id FROM song_blacklist
+                    WHERE channel = ? AND video_id IS NOT NULL
+                """, (channel,))
+                blacklist = {row[0] for row in cursor}
+            self._blacklist_cache.set(channel, blacklist)
+        return blacklist
     
     def add_to_blacklist(
         self,
@@ -475,7 +709,11 @@ class SongRequests(commands.Cog):
             cursor.execute("""
                 INSERT INTO song_blacklist (channel, video_id, channel_id, reason, added_by)
                 VALUES (?, ?, ?, ?, ?)
-            """, (channel.lower(), video_id, channel_id, reason, added_by))
+            """, (channel, video_id, channel_id, reason, added_by))
+        
+        blacklist = self._blacklist_cache.get(channel)
+        if blacklist is not None and video_id:
+            blacklist.add(video_id)
     
     def remove_from_blacklist(self, channel: str, video_id: str) -> bool:
         """Remove a song from the blacklist."""
@@ -483,8 +721,13 @@ class SongRequests(commands.Cog):
             cursor = conn.cursor()
             cursor.execute("""
                 DELETE FROM song_blacklist WHERE channel = ? AND video_id = ?
-            """, (channel.lower(), video_id))
-            return cursor.rowcount > 0
+            """, (channel, video_id))
+            removed = cursor.rowcount > 0
+        
+        blacklist = self._blacklist_cache.get(channel)
+        if blacklist is not None:
+            blacklist.discard(video_id)
+        return removed
     
     # ==================== Commands ====================
     
@@ -497,7 +740,7 @@ class SongRequests(commands.Cog):
             !sr <youtube url> - Request a song
             !sr on/off - Enable/disable song requests (mod only)
         """
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         settings = self.get_sr_settings(channel_name)
         
         # Check for mod commands
@@ -529,7 +772,7 @@ class SongRequests(commands.Cog):
             return
         
         # Get video info
-        video_info = get_youtube_info(query)
+        video_info = await get_youtube_info(await self._get_session(), query)
         if not video_info:
             await ctx.send(f"@{ctx.author.name} Could not find that video. Please use a valid YouTube URL.")
             return
@@ -539,10 +782,13 @@ class SongRequests(commands.Cog):
         duration = video_info.get("duration_seconds", 0)
         
         # Check if blacklisted
-        if self.is_song_blacklisted(channel_name, video_id):
+        if self._is_song_blacklisted_raw(channel_name, video_id):
             await ctx.send(f"@{ctx.author.name} That song is blacklisted.")
             return
         
+        user_id = str(ctx.author.id)
+        precheck = self._precheck_request(channel_name, user_id, video_id)
+        
         # Check duration limit
         max_duration = settings.get("max_duration_seconds", 600)
         if duration > 0 and duration > max_duration:
@@ -552,15 +798,13 @@ class SongRequests(commands.Cog):
             return
         
         # Check queue size
-        queue = self.get_queue(channel_name)
         max_queue = settings.get("max_queue_size", 50)
-        if len(queue) >= max_queue:
+        if precheck["queue_size"] >= max_queue:
             await ctx.send(f"@{ctx.author.name} The queue is full ({max_queue} songs max).")
             return
         
         # Check user limit
-        user_id = str(ctx.author.id)
-        user_count = self.get_user_queue_count(channel_name, user_id)
+        user_count = precheck["user_count"]
         
         is_subscriber = getattr(ctx.author, "is_subscriber", False)
         user_limit = settings.get("sub_limit", 5) if is_subscriber else settings.get("user_limit", 3)
@@ -573,13 +817,12 @@ class SongRequests(commands.Cog):
             return
         
         # Check if song already in queue
-        for song in queue:
-            if song["video_id"] == video_id:
-                await ctx.send(f"@{ctx.author.name} That song is already in the queue.")
-                return
+        if precheck["in_queue"]:
+            await ctx.send(f"@{ctx.author.name} That song is already in the queue.")
+            return
         
         # Add to queue
-        song_id = self.add_to_queue(
+        self.add_to_queue(
             channel=channel_name,
             video_id=video_id,
             title=title,
@@ -588,10 +831,11 @@ class SongRequests(commands.Cog):
             requested_by_id=user_id
         )
         
-        position = self.get_queue_position(channel_name, song_id)
+        # The new song is the latest request, so it goes after everything counted above
+        position = precheck["queue_size"] + 1
         
         # Truncate title if too long
-        display_title = title[:50] + "..." if len(title) > 50 else title
+        display_title = shorten_title(title, 50)
         
         await ctx.send(
             f"@{ctx.author.name} Added to queue (#{position}): \"{display_title}\""
@@ -604,14 +848,14 @@ class SongRequests(commands.Cog):
     @commands.command(name="queue", aliases=["songlist", "sl", "songs"])
     async def show_queue(self, ctx: Context) -> None:
         """Show the current song queue."""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         settings = self.get_sr_settings(channel_name)
         
         if not settings.get("enabled", False):
             await ctx.send(f"@{ctx.author.name} Song requests are currently disabled.")
             return
         
-        queue = self.get_queue(channel_name)
+        queue, total = self.get_queue_preview(channel_name, 5)
         
         if not queue:
             await ctx.send(f"@{ctx.author.name} The queue is empty.")
@@ -619,12 +863,11 @@ class SongRequests(commands.Cog):
         
         # Build queue message (show first 5)
         entries = []
-        for i, song in enumerate(queue[:5], 1):
-            title = song["title"][:30] + "..." if len(song["title"]) > 30 else song["title"]
+        for i, song in enumerate(queue, 1):
+            title = shorten_title(song["title"], 30)
             status = " [NOW]" if song["status"] == "playing" else ""
             entries.append(f"{i}. {title}{status}")
         
-        total = len(queue)
         more = f" (+{total - 5} more)" if total > 5 else ""
         
         await ctx.send(f"Queue ({total}): " + " | ".join(entries) + more)
@@ -632,7 +875,7 @@ class SongRequests(commands.Cog):
     @commands.command(name="currentsong", aliases=["song", "nowplaying", "np"])
     async def current_song(self, ctx: Context) -> None:
         """Show the currently playing song."""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         settings = self.get_sr_settings(channel_name)
         
         if not settings.get("enabled", False):
@@ -659,7 +902,7 @@ class SongRequests(commands.Cog):
     @is_moderator()
     async def skip_current(self, ctx: Context) -> None:
         """Skip the current song (mod only)."""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         
         current = self.get_current_song(channel_name)
         if not current:
@@ -682,7 +925,7 @@ class SongRequests(commands.Cog):
     @is_moderator()
     async def set_volume(self, ctx: Context, level: str = "") -> None:
         """Set or check the volume level (mod only). Usage: !volume [0-100]"""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         settings = self.get_sr_settings(channel_name)
         
         if not level:
@@ -705,7 +948,7 @@ class SongRequests(commands.Cog):
     @commands.command(name="wrongsong", aliases=["removesong", "oops"])
     async def wrong_song(self, ctx: Context) -> None:
         """Remove your last song request from the queue."""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         user_id = str(ctx.author.id)
         
         last_request = self.get_user_last_request(channel_name, user_id)
@@ -715,7 +958,7 @@ class SongRequests(commands.Cog):
             return
         
         if self.remove_from_queue(last_request["id"]):
-            title = last_request["title"][:40] + "..." if len(last_request["title"]) > 40 else last_request["title"]
+            title = shorten_title(last_request["title"], 40)
             await ctx.send(f"@{ctx.author.name} Removed \"{title}\" from the queue.")
             logger.info("Song removed by %s in %s: %s", ctx.author.name, channel_name, last_request["title"])
         else:
@@ -725,7 +968,7 @@ class SongRequests(commands.Cog):
     @is_moderator()
     async def clear_queue_cmd(self, ctx: Context) -> None:
         """Clear the entire song queue (mod only)."""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         
         count = self.clear_queue(channel_name)
         
@@ -739,7 +982,7 @@ class SongRequests(commands.Cog):
     @is_moderator()
     async def blacklist_song(self, ctx: Context, *, query: str = "") -> None:
         """Blacklist a song (mod only). Usage: !blacklist <youtube url>"""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         
         if not query:
             await ctx.send(f"@{ctx.author.name} Usage: !blacklist <youtube url>")
@@ -751,13 +994,15 @@ class SongRequests(commands.Cog):
             return
         
         # Check if already blacklisted
-        if self.is_song_blacklisted(channel_name, video_id):
+        if self._is_song_blacklisted_raw(channel_name, video_id):
             await ctx.send(f"@{ctx.author.name} That song is already blacklisted.")
             return
         
-        # Get video info for logging
-        video_info = get_youtube_info(query)
-        title = video_info["title"] if video_info else "Unknown"
+        # Get title for logging; only ask YouTube if the song was never queued or played here
+        title = self.get_known_title(channel_name, video_id)
+        if title is None:
+            video_info = await get_youtube_info(await self._get_session(), query)
+            title = video_info["title"] if video_info else "Unknown"
         
         self.add_to_blacklist(
             channel=channel_name,
@@ -768,10 +1013,7 @@ class SongRequests(commands.Cog):
         )
         
         # Remove from queue if present
-        queue = self.get_queue(channel_name)
-        for song in queue:
-            if song["video_id"] == video_id:
-                self.remove_from_queue(song["id"])
+        self.remove_video_from_queue(channel_name, video_id)
         
         await ctx.send(f"@{ctx.author.name} Blacklisted: \"{title}\"")
         logger.info("Song blacklisted by %s in %s: %s (%s)", ctx.author.name, channel_name, title, video_id)
@@ -780,7 +1022,7 @@ class SongRequests(commands.Cog):
     @is_moderator()
     async def unblacklist_song(self, ctx: Context, *, query: str = "") -> None:
         """Remove a song from the blacklist (mod only). Usage: !unblacklist <youtube url>"""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         
         if not query:
             await ctx.send(f"@{ctx.author.name} Usage: !unblacklist <youtube url>")
@@ -810,7 +1052,7 @@ class SongRequests(commands.Cog):
             !srset userlimit <number> - Set requests per user
             !srset sublimit <number> - Set requests per subscriber
         """
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         settings = self.get_sr_settings(channel_name)
         
         if not setting:
@@ -872,7 +1114,7 @@ class SongRequests(commands.Cog):
     @is_moderator()
     async def promote_song(self, ctx: Context, position: str = "") -> None:
         """Move a song to the front of the queue (mod only). Usage: !promote <position>"""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         
         if not position:
             await ctx.send(f"@{ctx.author.name} Usage: !promote <queue position>")
@@ -887,28 +1129,18 @@ class SongRequests(commands.Cog):
             await ctx.send(f"@{ctx.author.name} Please provide a valid position number.")
             return
         
-        queue = self.get_queue(channel_name)
-        
-        # Filter out currently playing
-        queued_songs = [s for s in queue if s["status"] == "queued"]
+        # Get the song to promote (1-indexed, currently playing song excluded)
+        song = self.get_queued_song_at(channel_name, pos)
         
-        if pos > len(queued_songs):
-            await ctx.send(f"@{ctx.author.name} Position {pos} doesn't exist. Queue has {len(queued_songs)} songs.")
+        if song is None:
+            queued_count = self.get_queued_count(channel_name)
+            await ctx.send(f"@{ctx.author.name} Position {pos} doesn't exist. Queue has {queued_count} songs.")
             return
         
-        # Get the song to promote (1-indexed)
-        song = queued_songs[pos - 1]
-        
         # Update its timestamp to be before all others
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE song_queue 
-                SET requested_at = datetime('now', '-1 hour')
-                WHERE id = ?
-            """, (song["id"],))
+        self.move_song_to_front(song["id"])
         
-        title = song["title"][:40] + "..." if len(song["title"]) > 40 else song["title"]
+        title = shorten_title(song["title"], 40)
         await ctx.send(f"@{ctx.author.name} Promoted \"{title}\" to the front of the queue.")
         logger.info("Song promoted by %s in %s: %s", ctx.author.name, channel_name, song["title"])
     
@@ -916,7 +1148,7 @@ class SongRequests(commands.Cog):
     @is_moderator()
     async def play_next(self, ctx: Context) -> None:
         """Start playing the next song in queue (mod only)."""
-        channel_name = ctx.channel.name
+        channel_name = ctx.channel.name.lower()
         
         # Mark current as played if exists
         current = self.get_current_song(channel_name)
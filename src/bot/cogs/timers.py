@@ -11,13 +11,14 @@ Provides scheduled message system with:
 from __future__ import annotations
 
 import asyncio
+from collections import Counter, defaultdict
 from datetime import datetime, timezone, timedelta
 from typing import TYPE_CHECKING, Optional, Any
 
 from twitchio.ext import commands
 from twitchio.ext.commands import Context
 
-from bot.utils.database import get_database, DatabaseManager
+from bot.utils.database import get_database, DatabaseManager, Timer
 from bot.utils.logging import get_logger
 from bot.utils.permissions import is_owner, is_moderator
 from bot.utils.variables import get_variable_parser, VariableParser
@@ -26,8 +27,25 @@ if TYPE_CHECKING:
     from twitchio import Message, Channel
     from bot.bot import TwitchBot
 
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    def _parse_iso(value: str) -> datetime:
+        # fromisoformat only understands a trailing "Z" from Python 3.11
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        return datetime.fromisoformat(value)
+
 logger = get_logger(__name__)
 
+# Recheck interval for timers that are due but still waiting on chat activity
+TIMER_POLL_INTERVAL = 30.0  # seconds
+# Longest the loop sleeps, so timers added from the dashboard are picked up
+TIMER_MAX_SLEEP = 300.0  # seconds
+
+# Shared stand-in for channels with no chat activity yet; never written to
+_NO_CHAT: Counter[str] = Counter()
+
 
 class Timers(commands.Cog):
     """
@@ -48,12 +66,21 @@ class Timers(commands.Cog):
         
         # Track chat activity per channel per timer
         # Structure: {channel_name: {timer_name: line_count}}
-        self._chat_lines: dict[str, dict[str, int]] = {}
+        self._chat_lines: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        # Lines per channel since the last check, folded into _chat_lines there
+        self._msg_count: Counter[str] = Counter()
         self._last_timer_check: dict[str, datetime] = {}
         
+        # Names of the enabled timers, refreshed by the timer loop
+        self._timer_names: frozenset[str] = frozenset()
+        # Timer name -> (raw last_triggered value, parsed UTC datetime)
+        self._last_triggered_parsed: dict[str, tuple[str, datetime]] = {}
+        
         # Timer task
         self._timer_task: Optional[asyncio.Task] = None
         self._running = False
+        # Set when a timer command changes timers, to wake the loop early
+        self._timers_changed = asyncio.Event()
         
         logger.info("Timers cog initialized")
     
@@ -79,13 +106,18 @@ class Timers(commands.Cog):
         await self.bot.wait_until_ready()
         
         while self._running:
+            self._timers_changed.clear()
+            delay = TIMER_POLL_INTERVAL
             try:
-                await self._check_timers()
+                delay = await self._check_timers()
             except Exception as e:
                 logger.error("Error in timer loop: %s", e)
             
-            # Check every 30 seconds
-            await asyncio.sleep(30)
+            # Sleep until the next timer is due, or until a timer is changed
+            try:
+                await asyncio.wait_for(self._timers_changed.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
     
     def _sanitize_timer_message(self, message: str) -> str:
         """Remove IRC commands from timer messages.
@@ -110,60 +142,105 @@ class Timers(commands.Cog):
             message = message[1:]
         return message
     
-    async def _check_timers(self) -> None:
-        """Check all timers and trigger if ready."""
+    def _refresh_timers(self) -> list[Timer]:
+        """Load enabled timers from the database and record their names."""
         timers = self.db.get_enabled_timers()
+        self._timer_names = frozenset(timer.name for timer in timers)
+        return timers
+    
+    def _invalidate_timers(self) -> None:
+        """Wake the timer loop so it reloads timers after one was changed."""
+        self._timers_changed.set()
+    
+    def _parse_last_triggered(self, name: str, last_triggered: Any, now: datetime) -> datetime:
+        """
+        Get a timer's last trigger time as a UTC datetime.
+        
+        The parsed value is kept per timer until the stored timestamp
+        changes, so unchanged timers aren't re-parsed every loop.
+        """
+        if not last_triggered:
+            return now - timedelta(hours=1)
+        if not isinstance(last_triggered, str):
+            return last_triggered.replace(tzinfo=timezone.utc)
+        
+        cached = self._last_triggered_parsed.get(name)
+        if cached is not None and cached[0] == last_triggered:
+            return cached[1]
+        
+        try:
+            last_dt = _parse_iso(last_triggered)
+        except ValueError:
+            return now - timedelta(hours=1)
+        last_dt = last_dt.replace(tzinfo=timezone.utc)
+        self._last_triggered_parsed[name] = (last_triggered, last_dt)
+        return last_dt
+    
+    async def _check_timers(self) -> float:
+        """
+        Check all timers and trigger if ready.
+        
+        Returns:
+            Seconds until the next timer could fire
+        """
+        # Always reload here so dashboard edits are picked up every loop
+        timers = self._refresh_timers()
         now = datetime.now(timezone.utc)
+        self._flush_chat_lines()
         
+        # Phase 1: timers whose interval has elapsed (independent of channel)
+        due = []
+        next_check = TIMER_MAX_SLEEP
         for timer in timers:
-            name = timer["name"]
-            interval = timer.get("interval_minutes", 15)
-            chat_required = timer.get("chat_lines_required", 5)
-            online_only = timer.get("online_only", True)
-            last_triggered = timer.get("last_triggered")
-            
-            # Parse last triggered time
-            if last_triggered:
-                if isinstance(last_triggered, str):
-                    try:
-                        last_dt = datetime.fromisoformat(last_triggered.replace("Z", "+00:00"))
-                    except ValueError:
-                        last_dt = now - timedelta(hours=1)
-                else:
-                    last_dt = last_triggered
+            last_dt = self._parse_last_triggered(timer.name, timer.last_triggered, now)
+            remaining = timer.interval_minutes * 60 - (now - last_dt).total_seconds()
+            if remaining > 0:
+                next_check = min(next_check, max(remaining, 1.0))
             else:
-                last_dt = now - timedelta(hours=1)
-            
-            # Check if enough time has passed
-            elapsed_minutes = (now - last_dt.replace(tzinfo=timezone.utc)).total_seconds() / 60
-            if elapsed_minutes < interval:
-                continue
+                due.append(timer)
+        
+        if not due:
+            return next_check
+        
+        # Phase 2: one pass over channels, checking each due timer's chat activity
+        for channel in self.bot.connected_channels:
+            channel_name = channel.name
+            counter = self._chat_lines.get(channel_name, _NO_CHAT)
             
-            # Check each connected channel
-            for channel in self.bot.connected_channels:
-                channel_name = channel.name
-                
+            for timer in due:
+                name = timer.name
                 # Check chat activity for this specific timer
-                channel_timers = self._chat_lines.get(channel_name, {})
-                chat_lines = channel_timers.get(name, 0)
-                if chat_lines < chat_required:
+                if counter.get(name, 0) < timer.chat_lines_required:
                     continue
                 
                 # Trigger the timer
                 await self._trigger_timer(timer, channel)
                 
                 # Reset chat counter only for this specific timer
-                if channel_name in self._chat_lines:
-                    self._chat_lines[channel_name][name] = 0
+                if counter is not _NO_CHAT:
+                    counter[name] = 0
                 
                 # Update last triggered
                 self.db.update_timer_triggered(name)
                 
                 logger.debug("Timer %s triggered in %s", name, channel_name)
+        
+        # Due timers that lacked chat activity are retried at the poll interval
+        return min(next_check, TIMER_POLL_INTERVAL)
+    
+    def _flush_chat_lines(self) -> None:
+        """Credit chat lines buffered since the last check to every enabled timer."""
+        if not self._msg_count:
+            return
+        pending, self._msg_count = self._msg_count, Counter()
+        for channel_name, lines in pending.items():
+            counter = self._chat_lines[channel_name]
+            for timer_name in self._timer_names:
+                counter[timer_name] += lines
     
-    async def _trigger_timer(self, timer: dict, channel: Channel) -> None:
+    async def _trigger_timer(self, timer: Timer, channel: Channel) -> None:
         """Trigger a timer and send its message."""
-        message_template = timer.get("message", "")
+        message_template = timer.message
         if not message_template:
             return
         
@@ -189,17 +266,8 @@ class Timers(commands.Cog):
         if message.echo or not message.channel:
             return
         
-        channel_name = message.channel.name
-        
-        # Initialize channel dict if needed
-        if channel_name not in self._chat_lines:
-            self._chat_lines[channel_name] = {}
-        
-        # Increment counter for all enabled timers
-        timers = self.db.get_enabled_timers()
-        for timer in timers:
-            timer_name = timer["name"]
-            self._chat_lines[channel_name][timer_name] = self._chat_lines[channel_name].get(timer_name, 0) + 1
+        # Buffered per channel; the timer loop credits each timer on its next check
+        self._msg_count[message.channel.name] += 1
     
     @commands.command(name="addtimer")
     @is_moderator()
@@ -220,13 +288,13 @@ class Timers(commands.Cog):
             await ctx.send(f"@{ctx.author.name} Interval must be a number (minutes)")
             return
         
-        existing = self.db.get_timer(name)
-        if existing:
+        if self.db.timer_exists(name):
             await ctx.send(f"@{ctx.author.name} Timer already exists. Use !edittimer to modify.")
             return
         
         try:
             self.db.create_timer(name=name, message=message, interval_minutes=interval_int, created_by=ctx.author.name)
+            self._invalidate_timers()
             await ctx.send(f"@{ctx.author.name} Timer created! Interval: {interval_int} minutes")
             logger.info("Timer %s created by %s", name, ctx.author.name)
         except Exception as e:
@@ -244,6 +312,7 @@ class Timers(commands.Cog):
         name = name.lower()
         
         if self.db.update_timer(name, message=message):
+            self._invalidate_timers()
             await ctx.send(f"@{ctx.author.name} Timer updated!")
             logger.info("Timer %s edited by %s", name, ctx.author.name)
         else:
@@ -260,6 +329,7 @@ class Timers(commands.Cog):
         name = name.lower()
         
         if self.db.delete_timer(name):
+            self._invalidate_timers()
             await ctx.send(f"@{ctx.author.name} Timer deleted.")
             logger.info("Timer %s deleted by %s", name, ctx.author.name)
         else:
@@ -280,10 +350,10 @@ class Timers(commands.Cog):
             await ctx.send(f"@{ctx.author.name} Timer not found.")
             return
         
-        interval = timer.get("interval_minutes", 15)
-        chat_req = timer.get("chat_lines_required", 5)
-        online_only = "Yes" if timer.get("online_only", True) else "No"
-        enabled = "Yes" if timer.get("enabled", True) else "No"
+        interval = timer.interval_minutes
+        chat_req = timer.chat_lines_required
+        online_only = "Yes" if timer.online_only else "No"
+        enabled = "Yes" if timer.enabled else "No"
         
         await ctx.send(f"@{ctx.author.name} Timer: Interval: {interval}m | Chat lines: {chat_req} | Online only: {online_only} | Enabled: {enabled}")
     
@@ -307,6 +377,7 @@ class Timers(commands.Cog):
             return
         
         if self.db.update_timer(name, interval_minutes=interval_int):
+            self._invalidate_timers()
             await ctx.send(f"@{ctx.author.name} Timer interval set to {interval_int} minutes")
         else:
             await ctx.send(f"@{ctx.author.name} Timer not found.")
@@ -331,6 +402,7 @@ class Timers(commands.Cog):
             return
         
         if self.db.update_timer(name, chat_lines_required=lines_int):
+            self._invalidate_timers()
             await ctx.send(f"@{ctx.author.name} Timer chat requirement set to {lines_int} lines")
         else:
             await ctx.send(f"@{ctx.author.name} Timer not found.")
@@ -344,22 +416,15 @@ class Timers(commands.Cog):
             return
         
         name = name.lower()
-        timer = self.db.get_timer(name)
-        
-        if not timer:
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM timers WHERE name = ?", (name,))
-                row = cursor.fetchone()
-                if row:
-                    timer = dict(row)
+        enabled = self.db.get_timer_enabled(name)
         
-        if not timer:
+        if enabled is None:
             await ctx.send(f"@{ctx.author.name} Timer not found.")
             return
         
-        new_state = not timer.get("enabled", True)
+        new_state = not enabled
         self.db.update_timer(name, enabled=new_state)
+        self._invalidate_timers()
         
         state_str = "enabled" if new_state else "disabled"
         await ctx.send(f"@{ctx.author.name} Timer is now {state_str}")
@@ -376,8 +441,8 @@ class Timers(commands.Cog):
         
         timer_list = []
         for t in timers:
-            status = "ON" if t.get("enabled", True) else "OFF"
-            timer_list.append(f"{t['name']} ({status})")
+            status = "ON" if t.enabled else "OFF"
+            timer_list.append(f"{t.name} ({status})")
         
         await ctx.send(f"@{ctx.author.name} Timers: " + ", ".join(timer_list))
 
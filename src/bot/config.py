@@ -9,8 +9,9 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable
 
 from dotenv import load_dotenv
 
@@ -68,7 +69,7 @@ class Config:
     api_timeout: int = 10
 
     # Computed/derived fields
-    _secrets: list[str] = field(default_factory=list, repr=False)
+    _secrets: tuple[str, ...] = field(default=(), repr=False)
 
     def __post_init__(self) -> None:
         """Initialize secrets list for log filtering."""
@@ -80,10 +81,10 @@ class Config:
             self.refresh_token,
         ]
         # Filter out empty strings
-        object.__setattr__(self, "_secrets", [s for s in secrets if s])
+        object.__setattr__(self, "_secrets", tuple(s for s in secrets if s))
 
     @property
-    def secrets(self) -> list[str]:
+    def secrets(self) -> tuple[str, ...]:
         """Get list of secret values that should be filtered from logs."""
         return self._secrets
 
@@ -121,10 +122,75 @@ def _parse_channels(value: str | None) -> list[str]:
     return [ch for ch in channels if ch]
 
 
+# Placeholder values shipped in .env.example count as "not set"
+_PLACEHOLDERS: dict[str, str] = {
+    "TWITCH_CLIENT_ID": "your_client_id_here",
+    "TWITCH_CLIENT_SECRET": "your_client_secret_here",
+    "TWITCH_OAUTH_TOKEN": "oauth:your_token_here",
+    "TWITCH_BOT_NICK": "your_bot_username",
+    "BOT_OWNER": "your_twitch_username",
+    "TWITCH_REFRESH_TOKEN": "your_refresh_token_here",
+}
+
+_VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+
+
+def _parse_str(value: str | None, default: str = "") -> str:
+    """Parse a plain string, using the default only when the variable is unset."""
+    return default if value is None else value
+
+
+def _parse_log_level(value: str | None) -> str:
+    """Parse a logging level name, falling back to INFO if invalid."""
+    level = _parse_str(value, "INFO").upper()
+    return level if level in _VALID_LOG_LEVELS else "INFO"
+
+
+# (Config field, environment variable, parser, error if missing) in error-report order
+_REQUIRED_SETTINGS: tuple[tuple[str, str, Callable[[str | None], Any], str], ...] = (
+    ("client_id", "TWITCH_CLIENT_ID", _parse_str, "TWITCH_CLIENT_ID is required"),
+    ("client_secret", "TWITCH_CLIENT_SECRET", _parse_str, "TWITCH_CLIENT_SECRET is required"),
+    ("oauth_token", "TWITCH_OAUTH_TOKEN", _parse_str, "TWITCH_OAUTH_TOKEN is required"),
+    ("bot_nick", "TWITCH_BOT_NICK", _parse_str, "TWITCH_BOT_NICK is required"),
+    ("channels", "TWITCH_CHANNELS", _parse_channels, "TWITCH_CHANNELS is required (comma-separated list)"),
+    ("owner", "BOT_OWNER", _parse_str, "BOT_OWNER is required"),
+)
+
+# (Config field, environment variable, parser applying the default)
+_OPTIONAL_SETTINGS: tuple[tuple[str, str, Callable[[str | None], Any]], ...] = (
+    ("refresh_token", "TWITCH_REFRESH_TOKEN", _parse_str),
+    ("prefix", "BOT_PREFIX", partial(_parse_str, default="!")),
+    ("log_level", "LOG_LEVEL", _parse_log_level),
+    ("log_file", "LOG_FILE", lambda value: value or None),
+    ("database_url", "DATABASE_URL", partial(_parse_str, default="sqlite:///data/bot.db")),
+    # Feature flags
+    ("enable_moderation", "ENABLE_MODERATION", partial(_parse_bool, default=True)),
+    ("enable_fun_commands", "ENABLE_FUN_COMMANDS", partial(_parse_bool, default=True)),
+    ("enable_info_commands", "ENABLE_INFO_COMMANDS", partial(_parse_bool, default=True)),
+    ("enable_admin_commands", "ENABLE_ADMIN_COMMANDS", partial(_parse_bool, default=True)),
+    # Rate limiting
+    ("default_cooldown", "DEFAULT_COOLDOWN", partial(_parse_int, default=3)),
+    ("api_timeout", "API_TIMEOUT", partial(_parse_int, default=10)),
+)
+
+
+def _getenv(name: str) -> str | None:
+    """Read an environment variable, treating .env.example placeholders as unset."""
+    value = os.getenv(name)
+    if value is not None and value == _PLACEHOLDERS.get(name):
+        return None
+    return value
+
+
+@lru_cache(maxsize=1)
 def load_config(env_file: str | Path | None = None) -> Config:
     """
     Load configuration from environment variables and .env file.
 
+    The result is cached, so repeated calls return the same Config
+    without re-reading the environment. Call ``load_config.cache_clear()``
+    to force a fresh load.
+
     Args:
         env_file: Optional path to .env file. If not provided,
                   looks for .env in current directory and parent directories.
@@ -144,31 +210,14 @@ def load_config(env_file: str | Path | None = None) -> Config:
 
     # Collect validation errors
     errors: list[str] = []
+    values: dict[str, Any] = {}
 
     # Required fields
-    client_id = os.getenv("TWITCH_CLIENT_ID", "")
-    if not client_id or client_id == "your_client_id_here":
-        errors.append("TWITCH_CLIENT_ID is required")
-
-    client_secret = os.getenv("TWITCH_CLIENT_SECRET", "")
-    if not client_secret or client_secret == "your_client_secret_here":
-        errors.append("TWITCH_CLIENT_SECRET is required")
-
-    oauth_token = os.getenv("TWITCH_OAUTH_TOKEN", "")
-    if not oauth_token or oauth_token == "oauth:your_token_here":
-        errors.append("TWITCH_OAUTH_TOKEN is required")
-
-    bot_nick = os.getenv("TWITCH_BOT_NICK", "")
-    if not bot_nick or bot_nick == "your_bot_username":
-        errors.append("TWITCH_BOT_NICK is required")
-
-    channels = _parse_channels(os.getenv("TWITCH_CHANNELS"))
-    if not channels:
-        errors.append("TWITCH_CHANNELS is required (comma-separated list)")
-
-    owner = os.getenv("BOT_OWNER", "")
-    if not owner or owner == "your_twitch_username":
-        errors.append("BOT_OWNER is required")
+    for name, env_var, parse, error in _REQUIRED_SETTINGS:
+        value = parse(_getenv(env_var))
+        if not value:
+            errors.append(error)
+        values[name] = value
 
     # Raise all errors at once
     if errors:
@@ -176,46 +225,7 @@ def load_config(env_file: str | Path | None = None) -> Config:
         raise ValueError(error_msg)
 
     # Optional fields
-    refresh_token = os.getenv("TWITCH_REFRESH_TOKEN", "")
-    if refresh_token == "your_refresh_token_here":
-        refresh_token = ""
-
-    prefix = os.getenv("BOT_PREFIX", "!")
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-    log_file = os.getenv("LOG_FILE") or None
-    database_url = os.getenv("DATABASE_URL", "sqlite:///data/bot.db")
+    for name, env_var, parse in _OPTIONAL_SETTINGS:
+        values[name] = parse(_getenv(env_var))
 
-    # Feature flags
-    enable_moderation = _parse_bool(os.getenv("ENABLE_MODERATION"), True)
-    enable_fun_commands = _parse_bool(os.getenv("ENABLE_FUN_COMMANDS"), True)
-    enable_info_commands = _parse_bool(os.getenv("ENABLE_INFO_COMMANDS"), True)
-    enable_admin_commands = _parse_bool(os.getenv("ENABLE_ADMIN_COMMANDS"), True)
-
-    # Rate limiting
-    default_cooldown = _parse_int(os.getenv("DEFAULT_COOLDOWN"), 3)
-    api_timeout = _parse_int(os.getenv("API_TIMEOUT"), 10)
-
-    # Validate log level
-    valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-    if log_level not in valid_levels:
-        log_level = "INFO"
-
-    return Config(
-        client_id=client_id,
-        client_secret=client_secret,
-        oauth_token=oauth_token,
-        refresh_token=refresh_token,
-        bot_nick=bot_nick,
-        channels=channels,
-        prefix=prefix,
-        owner=owner,
-        log_level=log_level,
-        log_file=log_file,
-        database_url=database_url,
-        enable_moderation=enable_moderation,
-        enable_fun_commands=enable_fun_commands,
-        enable_info_commands=enable_info_commands,
-        enable_admin_commands=enable_admin_commands,
-        default_cooldown=default_cooldown,
-        api_timeout=api_timeout,
-    )
+    return Config(**values)
@@ -5,6 +5,7 @@ Provides:
 - logging: Logging setup with secret filtering
 - permissions: Permission decorators for commands
 - database: SQLite database manager for automod
+- cache: Bounded TTL/LRU cache
 - spam_detector: Spam detection system
 - strikes: Strike/warning system
 - variables: Variable parser for custom commands
@@ -18,7 +19,8 @@ from bot.utils.permissions import (
     cooldown,
     CooldownBucket,
 )
-from bot.utils.database import get_database, DatabaseManager
+from bot.utils.cache import TTLCache
+from bot.utils.database import get_database, DatabaseManager, Timer
 from bot.utils.spam_detector import get_spam_detector, SpamDetector, SpamResult, ModAction
 from bot.utils.strikes import get_strike_manager, StrikeManager, StrikeResult, StrikeAction
 from bot.utils.variables import get_variable_parser, VariableParser, VARIABLE_DOCS
@@ -33,6 +35,8 @@ __all__ = [
     "CooldownBucket",
     "get_database",
     "DatabaseManager",
+    "Timer",
+    "TTLCache",
     "get_spam_detector",
     "SpamDetector",
     "SpamResult",
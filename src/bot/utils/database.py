@@ -15,20 +15,87 @@ Handles:
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import time
 from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import TYPE_CHECKING, Generator, Optional, Any
+from typing import TYPE_CHECKING, Generator, Iterable, Optional, Any, Sequence
 
 from bot.utils.logging import get_logger
+from bot.utils.serialization import json_dumps, json_loads
 
 if TYPE_CHECKING:
     pass
 
 logger = get_logger(__name__)
 
+# Negative cache_size is in KiB: 64 MiB page cache per connection
+SQLITE_CACHE_SIZE = -65536
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+# Seconds a write waits on the dashboard's lock before raising "database is locked"
+SQLITE_BUSY_TIMEOUT = 5.0
+# Prepared statements kept per connection. Every cog shares the one writer
+# connection, and together they issue ~270 distinct queries, so the old
+# limit of 256 let rarely used statements push out the hot ones
+SQLITE_CACHED_STATEMENTS = 512
+
+# Stored in PRAGMA user_version once _init_database has run; bump it whenever
+# the tables, indexes or migrations there change
+SCHEMA_VERSION = 3
+
+# Columns update_filter_settings may write (keys are interpolated into SQL)
+_FILTER_SETTINGS_COLUMNS = frozenset({
+    "caps_enabled", "caps_min_length", "caps_max_percent",
+    "emote_enabled", "emote_max_count",
+    "symbol_enabled", "symbol_max_percent",
+    "link_enabled",
+    "length_enabled", "length_max_chars",
+    "repetition_enabled", "repetition_max_words",
+    "zalgo_enabled", "lookalike_enabled",
+})
+
+# custom_commands.aliases as a JSON array built from command_aliases (NULL if none).
+# The dashboard reads that column; command_aliases is what lookups use.
+_SQL_ALIASES_JSON = (
+    "(SELECT CASE WHEN COUNT(*) > 0 THEN json_group_array(alias) END "
+    "FROM command_aliases WHERE command_name = ?)"
+)
+
+
+@dataclass(slots=True)
+class Timer:
+    """A timer row with column defaults applied."""
+    id: int
+    name: str
+    message: str
+    interval_minutes: int = 15
+    chat_lines_required: int = 5
+    online_only: bool = True
+    enabled: bool = True
+    last_triggered: Optional[str] = None
+    created_by: Optional[str] = None
+    
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> Timer:
+        """Build a Timer from a timers table row, filling NULL columns with defaults."""
+        interval = row["interval_minutes"]
+        chat_lines = row["chat_lines_required"]
+        online_only = row["online_only"]
+        enabled = row["enabled"]
+        return cls(
+            id=row["id"],
+            name=row["name"],
+            message=row["message"],
+            interval_minutes=15 if interval is None else interval,
+            chat_lines_required=5 if chat_lines is None else chat_lines,
+            online_only=True if online_only is None else bool(online_only),
+            enabled=True if enabled is None else bool(enabled),
+            last_triggered=row["last_triggered"],
+            created_by=row["created_by"],
+        )
+
 
 class DatabaseManager:
     """
@@ -46,6 +113,11 @@ class DatabaseManager:
     - Giveaways
     """
     
+    # Long-lived connection shared by every get_connection() call
+    _conn: Optional[sqlite3.Connection] = None
+    _read_conn: Optional[sqlite3.Connection] = None
+    _depth: int = 0
+    
     def __init__(self, db_path: str = "/opt/twitch-bot/data/automod.db") -> None:
         """
         Initialize the database manager.
@@ -58,31 +130,137 @@ class DatabaseManager:
         self._init_database()
         logger.info("Database initialized at %s", self.db_path)
     
+    def _get_raw_connection(self) -> sqlite3.Connection:
+        """
+        Get the persistent connection, opening it on first use.
+        
+        Keeping a single connection open lets SQLite reuse its statement
+        cache instead of re-parsing every query on a fresh connection.
+        
+        Returns:
+            sqlite3.Connection: Database connection
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=SQLITE_BUSY_TIMEOUT,
+                cached_statements=SQLITE_CACHED_STATEMENTS,
+            )
+            conn.row_factory = sqlite3.Row
+            # WAL lets the dashboard read while the bot writes, and with
+            # synchronous=NORMAL commits no longer fsync on every write
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._apply_cache_pragmas(conn)
+            self._conn = conn
+        return self._conn
+    
+    @staticmethod
+    def _apply_cache_pragmas(conn: sqlite3.Connection) -> None:
+        """Apply per-connection memory settings (page cache, mmap, temp tables)."""
+        conn.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+    
     @contextmanager
     def get_connection(self) -> Generator[sqlite3.Connection, None, None]:
         """
-        Get a database connection with automatic cleanup.
+        Get the database connection with automatic commit/rollback.
+        
+        Nested calls run inside a SAVEPOINT of the outer transaction, so a
+        failing inner block only undoes its own writes; only the outermost
+        block commits or rolls back.
         
         Yields:
             sqlite3.Connection: Database connection
         """
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        conn = self._get_raw_connection()
+        savepoint = f"sp_{self._depth}" if self._depth else None
+        if savepoint:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        self._depth += 1
         try:
             yield conn
-            conn.commit()
+            if savepoint:
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
+            if savepoint:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.rollback()
             logger.error("Database error: %s", e)
             raise
         finally:
-            conn.close()
+            self._depth -= 1
+    
+    @property
+    def in_transaction_block(self) -> bool:
+        """Whether a get_connection() block is currently open."""
+        return self._depth > 0
+    
+    @contextmanager
+    def get_read_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Get a persistent read-only connection for query-only paths.
+        
+        Reads on this connection never join a write transaction held by
+        the main connection, so history/list queries stay independent of
+        in-progress writes.
+        
+        Yields:
+            sqlite3.Connection: Read-only database connection
+        """
+        if self._read_conn is None:
+            conn = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                timeout=SQLITE_BUSY_TIMEOUT,
+                cached_statements=SQLITE_CACHED_STATEMENTS,
+            )
+            conn.row_factory = sqlite3.Row
+            self._apply_cache_pragmas(conn)
+            self._read_conn = conn
+        try:
+            yield self._read_conn
+        except Exception as e:
+            logger.error("Database error: %s", e)
+            raise
+    
+    def run_maintenance(self) -> None:
+        """
+        Prune expired permits, checkpoint the WAL and refresh query planner statistics.
+        
+        The passive checkpoint copies what it can without waiting on the
+        dashboard's readers, and optimize only re-analyzes tables whose
+        statistics have gone stale, so this is cheap to run periodically.
+        """
+        self.cleanup_expired_permits()
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            conn.execute("PRAGMA optimize")
+    
+    def close(self) -> None:
+        """Close the persistent database connections."""
+        if self._conn is not None:
+            self._conn.execute("PRAGMA optimize")
+            self._conn.close()
+            self._conn = None
+        if self._read_conn is not None:
+            self._read_conn.close()
+            self._read_conn = None
     
     def _init_database(self) -> None:
-        """Initialize database tables."""
+        """Initialize database tables, unless the schema is already current."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= SCHEMA_VERSION:
+                return
+            
             # User trust tracking table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS users (
@@ -117,9 +295,13 @@ class DatabaseManager:
                 CREATE TABLE IF NOT EXISTS permits (
                     user_id TEXT PRIMARY KEY,
                     granted_by TEXT,
-                    expires_at TIMESTAMP
+                    expires_at INTEGER  -- unix seconds
                 )
             """)
+            # Permits written before expires_at became unix seconds hold ISO
+            # strings, which compare greater than any integer; they only last
+            # minutes, so drop them rather than convert
+            cursor.execute("DELETE FROM permits WHERE typeof(expires_at) = 'text'")
             
             # ==================== NEW TABLES ====================
             
@@ -264,7 +446,7 @@ class DatabaseManager:
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS recent_messages (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    timestamp INTEGER DEFAULT (strftime('%s', 'now')),  -- unix seconds
                     channel TEXT NOT NULL,
                     user_id TEXT NOT NULL,
                     username TEXT NOT NULL,
@@ -274,6 +456,9 @@ class DatabaseManager:
                     is_mod BOOLEAN DEFAULT FALSE
                 )
             """)
+            # Rows from before timestamp became unix seconds hold text, which
+            # never ages out; they only cover the last two minutes, so drop them
+            cursor.execute("DELETE FROM recent_messages WHERE typeof(timestamp) = 'text'")
             
             # Cog settings table (for global feature toggles)
             cursor.execute("""
@@ -372,12 +557,8 @@ class DatabaseManager:
                 ON mod_actions(user_id)
             """)
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_users_username 
-                ON users(username)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_custom_commands_name
-                ON custom_commands(name)
+                CREATE INDEX IF NOT EXISTS idx_permits_expires_at
+                ON permits(expires_at)
             """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_user_strikes_user_id
@@ -388,12 +569,16 @@ class DatabaseManager:
                 ON user_loyalty(user_id, channel)
             """)
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_recent_messages_timestamp
-                ON recent_messages(timestamp)
+                CREATE INDEX IF NOT EXISTS idx_user_loyalty_channel_points
+                ON user_loyalty(channel, points DESC)
             """)
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_recent_messages_channel
-                ON recent_messages(channel)
+                CREATE INDEX IF NOT EXISTS idx_strike_history_user_timestamp
+                ON strike_history(user_id, timestamp)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_recent_messages_channel_timestamp
+                ON recent_messages(channel, timestamp)
             """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_cog_settings_channel
@@ -427,7 +612,20 @@ class DatabaseManager:
                 CREATE INDEX IF NOT EXISTS idx_banned_words_channel_enabled
                 ON banned_words(channel, enabled)
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_timers_enabled_last_triggered
+                ON timers(enabled, last_triggered) WHERE enabled = 1
+            """)
+            
+            # custom_commands.name is UNIQUE, so it already has an index, and
+            # nothing looks users up by username
+            cursor.execute("DROP INDEX IF EXISTS idx_custom_commands_name")
+            cursor.execute("DROP INDEX IF EXISTS idx_users_username")
+            # Replaced by idx_recent_messages_channel_timestamp
+            cursor.execute("DROP INDEX IF EXISTS idx_recent_messages_timestamp")
+            cursor.execute("DROP INDEX IF EXISTS idx_recent_messages_channel")
             
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             logger.info("Database tables initialized")
     
     # ==================== User Methods ====================
@@ -452,11 +650,10 @@ class DatabaseManager:
                 """
                 INSERT INTO users (user_id, username, trust_score, first_seen, message_count)
                 VALUES (?, ?, 50, CURRENT_TIMESTAMP, 0)
+                RETURNING *
                 """,
                 (user_id, username)
             )
-            
-            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
             return dict(cursor.fetchone())
     
     def update_user_message(self, user_id: str) -> None:
@@ -491,13 +688,10 @@ class DatabaseManager:
                 UPDATE users 
                 SET trust_score = MIN(100, MAX(0, trust_score + ?))
                 WHERE user_id = ?
+                RETURNING trust_score
                 """,
                 (delta, user_id)
             )
-            cursor.execute(
-                "SELECT trust_score FROM users WHERE user_id = ?",
-                (user_id,)
-            )
             row = cursor.fetchone()
             return row["trust_score"] if row else 50
     
@@ -528,30 +722,34 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "UPDATE users SET warnings_count = warnings_count + 1 WHERE user_id = ?",
-                (user_id,)
-            )
-            cursor.execute(
-                "SELECT warnings_count FROM users WHERE user_id = ?",
+                """
+                UPDATE users SET warnings_count = warnings_count + 1
+                WHERE user_id = ?
+                RETURNING warnings_count
+                """,
                 (user_id,)
             )
             row = cursor.fetchone()
             return row["warnings_count"] if row else 0
     
     def set_whitelisted(self, user_id: str, username: str, whitelisted: bool) -> None:
-        """Set user's whitelist status."""
-        self.get_or_create_user(user_id, username)
-        
+        """Set user's whitelist status, creating the user if needed."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "UPDATE users SET is_whitelisted = ? WHERE user_id = ?",
-                (whitelisted, user_id)
+                """
+                INSERT INTO users (user_id, username, trust_score, first_seen, message_count, is_whitelisted)
+                VALUES (?, ?, 50, CURRENT_TIMESTAMP, 0, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    username = excluded.username,
+                    is_whitelisted = excluded.is_whitelisted
+                """,
+                (user_id, username, whitelisted)
             )
     
     def is_whitelisted(self, user_id: str) -> bool:
         """Check if user is whitelisted."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT is_whitelisted FROM users WHERE user_id = ?",
@@ -562,7 +760,7 @@ class DatabaseManager:
     
     def get_user_stats(self, user_id: str) -> Optional[dict[str, Any]]:
         """Get user statistics."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
             row = cursor.fetchone()
@@ -595,7 +793,7 @@ class DatabaseManager:
     
     def get_recent_actions(self, limit: int = 10, channel: Optional[str] = None) -> list[dict[str, Any]]:
         """Get recent moderation actions."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             
             if channel:
@@ -622,7 +820,7 @@ class DatabaseManager:
     
     def get_user_actions(self, user_id: str, limit: int = 10) -> list[dict[str, Any]]:
         """Get moderation actions for a specific user."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -639,25 +837,27 @@ class DatabaseManager:
         """Get action statistics for the past N hours."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-            
+            # Cutoff computed in SQL so it has the same format as the
+            # CURRENT_TIMESTAMP-filled column; counts come back as one JSON row
             cursor.execute(
                 """
-                SELECT action, COUNT(*) as count 
-                FROM mod_actions 
-                WHERE timestamp > ?
-                GROUP BY action
+                SELECT json_group_object(action, count) FROM (
+                    SELECT action, COUNT(*) as count 
+                    FROM mod_actions 
+                    WHERE timestamp > datetime('now', ?)
+                    GROUP BY action
+                )
                 """,
-                (cutoff.isoformat(),)
+                (f"-{int(hours)} hours",)
             )
             
-            return {row["action"]: row["count"] for row in cursor.fetchall()}
+            return json_loads(cursor.fetchone()[0])
     
     # ==================== Permit Methods ====================
     
     def grant_permit(self, user_id: str, granted_by: str, duration_seconds: int = 60) -> None:
         """Grant a temporary link permit to a user."""
-        expires_at = datetime.now(timezone.utc) + timedelta(seconds=duration_seconds)
+        expires_at = int(time.time()) + duration_seconds
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -666,21 +866,19 @@ class DatabaseManager:
                 INSERT OR REPLACE INTO permits (user_id, granted_by, expires_at)
                 VALUES (?, ?, ?)
                 """,
-                (user_id, granted_by, expires_at.isoformat())
+                (user_id, granted_by, expires_at)
             )
     
     def has_valid_permit(self, user_id: str) -> bool:
         """Check if user has a valid (non-expired) permit."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
-            now = datetime.now(timezone.utc).isoformat()
-            
             cursor.execute(
                 """
                 SELECT 1 FROM permits 
                 WHERE user_id = ? AND expires_at > ?
                 """,
-                (user_id, now)
+                (user_id, int(time.time()))
             )
             
             return cursor.fetchone() is not None
@@ -696,8 +894,7 @@ class DatabaseManager:
         """Remove expired permits from database."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            now = datetime.now(timezone.utc).isoformat()
-            cursor.execute("DELETE FROM permits WHERE expires_at <= ?", (now,))
+            cursor.execute("DELETE FROM permits WHERE expires_at <= ?", (int(time.time()),))
             return cursor.rowcount
     
     # ==================== Custom Commands Methods ====================
@@ -716,59 +913,48 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            aliases_json = json.dumps(aliases) if aliases else None
-            
             cursor.execute(
                 """
                 INSERT INTO custom_commands 
-                (name, response, created_by, cooldown_user, cooldown_global, permission_level, aliases)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (name, response, created_by, cooldown_user, cooldown_global, permission_level)
+                VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (name.lower(), response, created_by, cooldown_user, cooldown_global, permission_level, aliases_json)
+                (name.lower(), response, created_by, cooldown_user, cooldown_global, permission_level)
             )
+            command_id = cursor.lastrowid or 0
             
-            # Add aliases to aliases table
+            # Add aliases to aliases table, then mirror them into the JSON column
             if aliases:
-                for alias in aliases:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO command_aliases (alias, command_name) VALUES (?, ?)",
-                        (alias.lower(), name.lower())
-                    )
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO command_aliases (alias, command_name) VALUES (?, ?)",
+                    [(alias.lower(), name.lower()) for alias in aliases]
+                )
+                cursor.execute(
+                    f"UPDATE custom_commands SET aliases = {_SQL_ALIASES_JSON} WHERE id = ?",
+                    (name.lower(), command_id)
+                )
             
-            return cursor.lastrowid or 0
+            return command_id
     
     def get_command(self, name: str) -> Optional[dict[str, Any]]:
         """Get a custom command by name or alias."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
-            
-            # First check direct name
+            # One lookup for both; a direct name match wins over an alias
             cursor.execute(
-                "SELECT * FROM custom_commands WHERE name = ? AND enabled = TRUE",
-                (name.lower(),)
+                """
+                SELECT * FROM custom_commands
+                WHERE enabled = 1 AND name IN (
+                    :name,
+                    (SELECT command_name FROM command_aliases WHERE alias = :name)
+                )
+                ORDER BY name = :name DESC
+                LIMIT 1
+                """,
+                {"name": name.lower()}
             )
             row = cursor.fetchone()
-            
-            if row:
-                return dict(row)
-            
-            # Check aliases
-            cursor.execute(
-                "SELECT command_name FROM command_aliases WHERE alias = ?",
-                (name.lower(),)
-            )
-            alias_row = cursor.fetchone()
-            
-            if alias_row:
-                cursor.execute(
-                    "SELECT * FROM custom_commands WHERE name = ? AND enabled = TRUE",
-                    (alias_row["command_name"],)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return dict(row)
-            
-            return None
+            return dict(row) if row else None
     
     def update_command(
         self,
@@ -801,18 +987,16 @@ class DatabaseManager:
                 params.append(permission_level)
             if enabled is not None:
                 updates.append("enabled = ?")
-                params.append(enabled)
+                params.append(int(enabled))
             if aliases is not None:
-                updates.append("aliases = ?")
-                params.append(json.dumps(aliases))
-                
-                # Update aliases table
+                # Update aliases table; the JSON column is rebuilt from it below
                 cursor.execute("DELETE FROM command_aliases WHERE command_name = ?", (name.lower(),))
-                for alias in aliases:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO command_aliases (alias, command_name) VALUES (?, ?)",
-                        (alias.lower(), name.lower())
-                    )
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO command_aliases (alias, command_name) VALUES (?, ?)",
+                    [(alias.lower(), name.lower()) for alias in aliases]
+                )
+                updates.append(f"aliases = {_SQL_ALIASES_JSON}")
+                params.append(name.lower())
             
             if not updates:
                 return False
@@ -875,13 +1059,30 @@ class DatabaseManager:
             )
             return cursor.lastrowid or 0
     
-    def get_timer(self, name: str) -> Optional[dict[str, Any]]:
+    def get_timer(self, name: str) -> Optional[Timer]:
         """Get a timer by name."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM timers WHERE name = ?", (name.lower(),))
             row = cursor.fetchone()
-            return dict(row) if row else None
+            return Timer.from_row(row) if row else None
+    
+    def timer_exists(self, name: str) -> bool:
+        """Check whether a timer with this name exists."""
+        with self.get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM timers WHERE name = ? LIMIT 1", (name.lower(),))
+            return cursor.fetchone() is not None
+    
+    def get_timer_enabled(self, name: str) -> Optional[bool]:
+        """Get whether a timer is enabled, or None if it doesn't exist."""
+        with self.get_read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT enabled FROM timers WHERE name = ?", (name.lower(),))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return True if row["enabled"] is None else bool(row["enabled"])
     
     def update_timer(
         self,
@@ -913,7 +1114,7 @@ class DatabaseManager:
                 params.append(online_only)
             if enabled is not None:
                 updates.append("enabled = ?")
-                params.append(enabled)
+                params.append(int(enabled))
             
             if not updates:
                 return False
@@ -934,19 +1135,21 @@ class DatabaseManager:
             cursor.execute("DELETE FROM timers WHERE name = ?", (name.lower(),))
             return cursor.rowcount > 0
     
-    def get_all_timers(self) -> list[dict[str, Any]]:
+    def get_all_timers(self) -> list[Timer]:
         """Get all timers."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM timers ORDER BY name")
-            return [dict(row) for row in cursor.fetchall()]
+            return [Timer.from_row(row) for row in cursor]
     
-    def get_enabled_timers(self) -> list[dict[str, Any]]:
-        """Get all enabled timers."""
-        with self.get_connection() as conn:
+    def get_enabled_timers(self) -> list[Timer]:
+        """Get all enabled timers, least recently triggered first."""
+        with self.get_read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM timers WHERE enabled = TRUE ORDER BY name")
-            return [dict(row) for row in cursor.fetchall()]
+            cursor.execute(
+                "SELECT * FROM timers WHERE enabled = 1 ORDER BY last_triggered, name"
+            )
+            return [Timer.from_row(row) for row in cursor]
     
     def update_timer_triggered(self, name: str) -> None:
         """Update timer's last triggered time."""
@@ -963,30 +1166,28 @@ class DatabaseManager:
         """Get user's strike information."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM user_strikes WHERE user_id = ?", (user_id,))
+            # Expiry is checked in SQL; unparseable expires_at values count as not expired
+            cursor.execute(
+                """
+                SELECT *, julianday('now') > julianday(expires_at) AS expired
+                FROM user_strikes WHERE user_id = ?
+                """,
+                (user_id,)
+            )
             row = cursor.fetchone()
             
             if row:
-                # Check if strikes have expired
-                expires_at = row["expires_at"]
-                if expires_at:
-                    try:
-                        if isinstance(expires_at, str):
-                            expires_dt = datetime.fromisoformat(expires_at.replace("Z", "+00:00"))
-                        else:
-                            expires_dt = expires_at
-                        
-                        if datetime.now(timezone.utc) > expires_dt.replace(tzinfo=timezone.utc):
-                            # Strikes have expired, reset
-                            cursor.execute(
-                                "UPDATE user_strikes SET strike_count = 0, expires_at = NULL WHERE user_id = ?",
-                                (user_id,)
-                            )
-                            return {"user_id": user_id, "strike_count": 0, "last_strike": None, "last_reason": None}
-                    except (ValueError, AttributeError):
-                        pass
+                if row["expired"]:
+                    # Strikes have expired, reset
+                    cursor.execute(
+                        "UPDATE user_strikes SET strike_count = 0, expires_at = NULL WHERE user_id = ?",
+                        (user_id,)
+                    )
+                    return {"user_id": user_id, "strike_count": 0, "last_strike": None, "last_reason": None}
                 
-                return dict(row)
+                strikes = dict(row)
+                del strikes["expired"]
+                return strikes
             
             return {"user_id": user_id, "strike_count": 0, "last_strike": None, "last_reason": None}
     
@@ -1004,26 +1205,28 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get current strikes
-            current = self.get_user_strikes(user_id)
-            new_count = current["strike_count"] + 1
-            
             expires_at = datetime.now(timezone.utc) + timedelta(days=expire_days)
             
-            # Update or insert strike record
+            # Update or insert strike record; expired strikes start over at 1
+            # (same rule as get_user_strikes, evaluated in the upsert itself)
             cursor.execute(
                 """
                 INSERT INTO user_strikes (user_id, username, strike_count, last_strike, last_reason, expires_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP, ?, ?)
+                VALUES (?, ?, 1, CURRENT_TIMESTAMP, ?, ?)
                 ON CONFLICT(user_id) DO UPDATE SET
                     username = excluded.username,
-                    strike_count = excluded.strike_count,
+                    strike_count = CASE
+                        WHEN julianday('now') > julianday(user_strikes.expires_at) THEN 1
+                        ELSE user_strikes.strike_count + 1
+                    END,
                     last_strike = CURRENT_TIMESTAMP,
                     last_reason = excluded.last_reason,
                     expires_at = excluded.expires_at
+                RETURNING strike_count
                 """,
-                (user_id, username, new_count, reason, expires_at.isoformat())
+                (user_id, username, reason, expires_at.isoformat())
             )
+            new_count = cursor.fetchone()[0]
             
             # Log to strike history
             cursor.execute(
@@ -1095,34 +1298,38 @@ class DatabaseManager:
         bonus_sub_multiplier: float | None = None,
         bonus_vip_multiplier: float | None = None
     ) -> None:
-        """Update loyalty settings for a channel."""
+        """Update loyalty settings for a channel (None leaves a setting unchanged)."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Get current settings
-            current = self.get_loyalty_settings(channel)
-            
-            new_enabled = enabled if enabled is not None else current["enabled"]
-            new_points_name = points_name if points_name is not None else current["points_name"]
-            new_ppm = points_per_minute if points_per_minute is not None else current["points_per_minute"]
-            new_ppmsg = points_per_message if points_per_message is not None else current["points_per_message"]
-            new_sub_mult = bonus_sub_multiplier if bonus_sub_multiplier is not None else current["bonus_sub_multiplier"]
-            new_vip_mult = bonus_vip_multiplier if bonus_vip_multiplier is not None else current["bonus_vip_multiplier"]
-            
+            # Unset values fall back to the stored row, or to the
+            # get_loyalty_settings defaults when the channel has none yet
             cursor.execute(
                 """
                 INSERT INTO loyalty_settings 
                 (channel, enabled, points_name, points_per_minute, points_per_message, bonus_sub_multiplier, bonus_vip_multiplier)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                VALUES (
+                    :channel, COALESCE(:enabled, 0), COALESCE(:points_name, 'points'),
+                    COALESCE(:ppm, 1.0), COALESCE(:ppmsg, 0.5),
+                    COALESCE(:sub_mult, 2.0), COALESCE(:vip_mult, 1.5)
+                )
                 ON CONFLICT(channel) DO UPDATE SET
-                    enabled = excluded.enabled,
-                    points_name = excluded.points_name,
-                    points_per_minute = excluded.points_per_minute,
-                    points_per_message = excluded.points_per_message,
-                    bonus_sub_multiplier = excluded.bonus_sub_multiplier,
-                    bonus_vip_multiplier = excluded.bonus_vip_multiplier
+                    enabled = COALESCE(:enabled, enabled),
+                    points_name = COALESCE(:points_name, points_name),
+                    points_per_minute = COALESCE(:ppm, points_per_minute),
+                    points_per_message = COALESCE(:ppmsg, points_per_message),
+                    bonus_sub_multiplier = COALESCE(:sub_mult, bonus_sub_multiplier),
+                    bonus_vip_multiplier = COALESCE(:vip_mult, bonus_vip_multiplier)
                 """,
-                (channel.lower(), new_enabled, new_points_name, new_ppm, new_ppmsg, new_sub_mult, new_vip_mult)
+                {
+                    "channel": channel.lower(),
+                    "enabled": enabled,
+                    "points_name": points_name,
+                    "ppm": points_per_minute,
+                    "ppmsg": points_per_message,
+                    "sub_mult": bonus_sub_multiplier,
+                    "vip_mult": bonus_vip_multiplier,
+                }
             )
     
     def get_user_loyalty(self, user_id: str, channel: str) -> dict[str, Any]:
@@ -1170,12 +1377,81 @@ class DatabaseManager:
                     watch_time_minutes = user_loyalty.watch_time_minutes + ?,
                     message_count = user_loyalty.message_count + ?,
                     last_seen = CURRENT_TIMESTAMP
+                RETURNING *
                 """,
                 (user_id, username, channel.lower(), points_delta, watch_time_delta, message_count_delta,
                  points_delta, watch_time_delta, message_count_delta)
             )
             
-            return self.get_user_loyalty(user_id, channel)
+            return dict(cursor.fetchone())
+    
+    def award_watch_time(
+        self,
+        channel: str,
+        user_ids: Iterable[str],
+        points_delta: float,
+        max_points: float
+    ) -> None:
+        """
+        Credit one minute of watch time and points to many users at once.
+        
+        Points are capped at max_points (balances already above it are left
+        as they are) and existing usernames are kept.
+        
+        Args:
+            channel: Channel name
+            user_ids: Users to credit
+            points_delta: Points to add per user
+            max_points: Balance cap
+        """
+        channel = channel.lower()
+        with self.get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO user_loyalty (user_id, username, channel, points, watch_time_minutes, message_count, last_seen)
+                VALUES (?, '', ?, MIN(?, MAX(0, ?)), 1, 0, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id, channel) DO UPDATE SET
+                    points = MAX(user_loyalty.points, MIN(?, user_loyalty.points + ?)),
+                    watch_time_minutes = user_loyalty.watch_time_minutes + 1,
+                    last_seen = CURRENT_TIMESTAMP
+                """,
+                [
+                    (user_id, channel, max_points, points_delta, max_points, points_delta)
+                    for user_id in user_ids
+                ]
+            )
+    
+    def award_message_points(
+        self,
+        rows: Iterable[tuple[str, str, str, float, int]],
+        max_points: float
+    ) -> None:
+        """
+        Credit chat message points to many users in one transaction.
+        
+        Points are capped at max_points the same way as award_watch_time.
+        
+        Args:
+            rows: (user_id, username, channel, points_delta, message_count_delta) tuples
+            max_points: Balance cap
+        """
+        with self.get_connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO user_loyalty (user_id, username, channel, points, watch_time_minutes, message_count, last_seen)
+                VALUES (?, ?, ?, MIN(?, MAX(0, ?)), 0, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(user_id, channel) DO UPDATE SET
+                    username = excluded.username,
+                    points = MAX(user_loyalty.points, MIN(?, user_loyalty.points + ?)),
+                    message_count = user_loyalty.message_count + excluded.message_count,
+                    last_seen = CURRENT_TIMESTAMP
+                """,
+                [
+                    (user_id, username, channel.lower(), max_points, points_delta,
+                     message_count_delta, max_points, points_delta)
+                    for user_id, username, channel, points_delta, message_count_delta in rows
+                ]
+            )
     
     def set_user_points(self, user_id: str, channel: str, points: float) -> None:
         """Set user's loyalty points (enforces non-negative)."""
@@ -1196,12 +1472,12 @@ class DatabaseManager:
             )
     
     def get_loyalty_leaderboard(self, channel: str, limit: int = 10) -> list[dict[str, Any]]:
-        """Get loyalty leaderboard for a channel."""
+        """Get loyalty leaderboard for a channel (user_id, username, points per row)."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT * FROM user_loyalty 
+                SELECT user_id, username, points FROM user_loyalty 
                 WHERE channel = ? 
                 ORDER BY points DESC 
                 LIMIT ?
@@ -1223,21 +1499,49 @@ class DatabaseManager:
         is_mod: bool = False
     ) -> None:
         """Add a message to recent messages cache."""
+        self.add_recent_messages([
+            (int(time.time()), channel.lower(), user_id, username, message, is_subscriber, is_vip, is_mod)
+        ])
+    
+    def add_recent_messages(
+        self,
+        rows: Sequence[tuple[int, str, str, str, str, bool, bool, bool]]
+    ) -> None:
+        """
+        Add a batch of messages to recent messages cache in one transaction.
+        
+        Args:
+            rows: (timestamp, channel, user_id, username, message, is_subscriber,
+                  is_vip, is_mod) tuples; timestamp is unix seconds and
+                  channel is lower-cased
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
+            cursor.executemany(
                 """
                 INSERT INTO recent_messages 
-                (channel, user_id, username, message, is_subscriber, is_vip, is_mod)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (timestamp, channel, user_id, username, message, is_subscriber, is_vip, is_mod)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (channel.lower(), user_id, username, message, is_subscriber, is_vip, is_mod)
+                rows
             )
-            
-            # Cleanup old messages (older than 2 minutes)
+    
+    def cleanup_recent_messages(self, max_age_seconds: int = 120) -> int:
+        """
+        Delete recent messages older than max_age_seconds.
+        
+        Called periodically by the nuke cog rather than on every insert.
+        
+        Returns:
+            int: Number of messages deleted
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
-                "DELETE FROM recent_messages WHERE timestamp < datetime('now', '-2 minutes')"
+                "DELETE FROM recent_messages WHERE timestamp < ?",
+                (int(time.time()) - max_age_seconds,)
             )
+            return cursor.rowcount
     
     def get_recent_messages(
         self,
@@ -1246,22 +1550,22 @@ class DatabaseManager:
         include_subs: bool = False,
         include_vips: bool = False
     ) -> list[dict[str, Any]]:
-        """Get recent messages for nuke command."""
+        """Get recent messages for nuke command (user_id, username, message per row)."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
             query = """
-                SELECT * FROM recent_messages 
+                SELECT user_id, username, message FROM recent_messages 
                 WHERE channel = ? 
-                AND timestamp > datetime('now', '-' || ? || ' seconds')
-                AND is_mod = FALSE
+                AND timestamp > ?
+                AND is_mod = 0
             """
-            params = [channel.lower(), lookback_seconds]
+            params = [channel.lower(), int(time.time()) - lookback_seconds]
             
             if not include_subs:
-                query += " AND is_subscriber = FALSE"
+                query += " AND is_subscriber = 0"
             if not include_vips:
-                query += " AND is_vip = FALSE"
+                query += " AND is_vip = 0"
             
             query += " ORDER BY timestamp DESC"
             
@@ -1287,7 +1591,7 @@ class DatabaseManager:
                 (moderator, channel, pattern, action, duration, users_affected, users_list)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                (moderator, channel.lower(), pattern, action, duration, users_affected, json.dumps(users_list))
+                (moderator, channel.lower(), pattern, action, duration, users_affected, json_dumps(users_list))
             )
             return cursor.lastrowid or 0
     
@@ -1323,46 +1627,27 @@ class DatabaseManager:
             }
     
     def update_filter_settings(self, channel: str, **kwargs) -> None:
-        """Update filter settings for a channel."""
+        """Update filter settings for a channel (unknown keys and None values are ignored)."""
+        channel = channel.lower()
+        updates = []
+        params = []
+        for key, value in kwargs.items():
+            if key in _FILTER_SETTINGS_COLUMNS and value is not None:
+                updates.append(f"{key} = ?")
+                params.append(value)
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            current = self.get_filter_settings(channel)
-            
-            # Merge with current settings
-            for key, value in kwargs.items():
-                if key in current and value is not None:
-                    current[key] = value
-            
-            cursor.execute(
-                """
-                INSERT INTO filter_settings 
-                (channel, caps_enabled, caps_min_length, caps_max_percent, emote_enabled, emote_max_count,
-                 symbol_enabled, symbol_max_percent, link_enabled, length_enabled, length_max_chars,
-                 repetition_enabled, repetition_max_words, zalgo_enabled, lookalike_enabled)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(channel) DO UPDATE SET
-                    caps_enabled = excluded.caps_enabled,
-                    caps_min_length = excluded.caps_min_length,
-                    caps_max_percent = excluded.caps_max_percent,
-                    emote_enabled = excluded.emote_enabled,
-                    emote_max_count = excluded.emote_max_count,
-                    symbol_enabled = excluded.symbol_enabled,
-                    symbol_max_percent = excluded.symbol_max_percent,
-                    link_enabled = excluded.link_enabled,
-                    length_enabled = excluded.length_enabled,
-                    length_max_chars = excluded.length_max_chars,
-                    repetition_enabled = excluded.repetition_enabled,
-                    repetition_max_words = excluded.repetition_max_words,
-                    zalgo_enabled = excluded.zalgo_enabled,
-                    lookalike_enabled = excluded.lookalike_enabled
-                """,
-                (current["channel"], current["caps_enabled"], current["caps_min_length"],
-                 current["caps_max_percent"], current["emote_enabled"], current["emote_max_count"],
-                 current["symbol_enabled"], current["symbol_max_percent"], current["link_enabled"],
-                 current["length_enabled"], current["length_max_chars"], current["repetition_enabled"],
-                 current["repetition_max_words"], current["zalgo_enabled"], current["lookalike_enabled"])
-            )
+            # New channels start from the column defaults, which match
+            # get_filter_settings; only the changed columns are written
+            cursor.execute("INSERT OR IGNORE INTO filter_settings (channel) VALUES (?)", (channel,))
+            if updates:
+                params.append(channel)
+                cursor.execute(
+                    f"UPDATE filter_settings SET {', '.join(updates)} WHERE channel = ?",
+                    params
+                )
     
     # ==================== Quotes Methods ====================
     
@@ -1414,7 +1699,7 @@ class DatabaseManager:
             cursor.execute(
                 """
                 SELECT * FROM quotes 
-                WHERE channel = ? AND id = ? AND enabled = TRUE
+                WHERE channel = ? AND id = ? AND enabled = 1
                 """,
                 (channel.lower(), quote_id)
             )
@@ -1436,7 +1721,7 @@ class DatabaseManager:
             cursor.execute(
                 """
                 SELECT * FROM quotes 
-                WHERE channel = ? AND enabled = TRUE
+                WHERE channel = ? AND enabled = 1
                 ORDER BY RANDOM()
                 LIMIT 1
                 """,
@@ -1460,7 +1745,7 @@ class DatabaseManager:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                UPDATE quotes SET enabled = FALSE
+                UPDATE quotes SET enabled = 0
                 WHERE channel = ? AND id = ?
                 """,
                 (channel.lower(), quote_id)
@@ -1482,7 +1767,7 @@ class DatabaseManager:
             cursor.execute(
                 """
                 SELECT * FROM quotes 
-                WHERE channel = ? AND enabled = TRUE
+                WHERE channel = ? AND enabled = 1
                 ORDER BY id ASC
                 """,
                 (channel.lower(),)
@@ -1504,7 +1789,7 @@ class DatabaseManager:
             cursor.execute(
                 """
                 SELECT COUNT(*) as count FROM quotes 
-                WHERE channel = ? AND enabled = TRUE
+                WHERE channel = ? AND enabled = 1
                 """,
                 (channel.lower(),)
             )
@@ -1527,7 +1812,7 @@ class DatabaseManager:
             cursor.execute(
                 """
                 SELECT * FROM quotes 
-                WHERE channel = ? AND enabled = TRUE
+                WHERE channel = ? AND enabled = 1
                 AND (quote_text LIKE ? OR author LIKE ?)
                 ORDER BY id ASC
                 LIMIT 10
@@ -2059,7 +2344,7 @@ class DatabaseManager:
                 cursor.execute(
                     """
                     SELECT * FROM banned_words 
-                    WHERE channel = ? AND enabled = TRUE
+                    WHERE channel = ? AND enabled = 1
                     ORDER BY word
                     """,
                     (channel.lower(),)
@@ -2132,7 +2417,7 @@ class DatabaseManager:
                 params.append(duration)
             if enabled is not None:
                 updates.append("enabled = ?")
-                params.append(enabled)
+                params.append(int(enabled))
             
             if not updates:
                 return False
@@ -2189,7 +2474,7 @@ class DatabaseManager:
                 params.append(duration)
             if enabled is not None:
                 updates.append("enabled = ?")
-                params.append(enabled)
+                params.append(int(enabled))
             
             if not updates:
                 return False
@@ -2365,3 +2650,9 @@ def get_database() -> DatabaseManager:
     if _db is None:
         _db = DatabaseManager()
     return _db
+
+
+def close_database() -> None:
+    """Close the global database manager's connection, if any."""
+    if _db is not None:
+        _db.close()
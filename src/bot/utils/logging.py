@@ -6,15 +6,19 @@ Provides a logging setup that:
 - Supports both console and file output
 - Configurable log levels
 - Includes timestamps and module names
+- Writes records from a background thread so handler I/O never blocks the event loop
 """
 
 from __future__ import annotations
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import re
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 
 if TYPE_CHECKING:
     from bot.config import Config
@@ -27,7 +31,7 @@ class SecretFilter(logging.Filter):
     Replaces any occurrence of registered secrets with [REDACTED].
     """
 
-    def __init__(self, secrets: list[str] | None = None) -> None:
+    def __init__(self, secrets: Sequence[str] | None = None) -> None:
         """
         Initialize the secret filter.
 
@@ -40,7 +44,7 @@ class SecretFilter(logging.Filter):
         if secrets:
             self.set_secrets(secrets)
 
-    def set_secrets(self, secrets: list[str]) -> None:
+    def set_secrets(self, secrets: Sequence[str]) -> None:
         """
         Set the list of secrets to filter.
 
@@ -132,6 +136,9 @@ class ColoredFormatter(logging.Formatter):
 # Global secret filter instance
 _secret_filter: SecretFilter | None = None
 
+# Background listener that drains the log queue into the real handlers
+_queue_listener: logging.handlers.QueueListener | None = None
+
 
 def setup_logging(config: Config) -> None:
     """
@@ -141,18 +148,24 @@ def setup_logging(config: Config) -> None:
     - Console handler with colored output
     - Optional file handler
     - Secret filtering on all handlers
+    - A queue in front of the handlers, drained by a background listener thread
 
     Args:
         config: Bot configuration with log settings
     """
-    global _secret_filter
+    global _secret_filter, _queue_listener
 
     # Create root logger for our bot
     logger = logging.getLogger("bot")
     logger.setLevel(getattr(logging, config.log_level, logging.INFO))
 
-    # Remove existing handlers
+    # Remove existing handlers (and stop a listener from a previous setup)
     logger.handlers.clear()
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+    handlers: list[logging.Handler] = []
 
     # Create secret filter
     _secret_filter = SecretFilter(config.secrets)
@@ -163,7 +176,7 @@ def setup_logging(config: Config) -> None:
     console_format = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
     console_handler.setFormatter(ColoredFormatter(console_format))
     console_handler.addFilter(_secret_filter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler if configured
     if config.log_file:
@@ -176,17 +189,35 @@ def setup_logging(config: Config) -> None:
         file_format = "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s"
         file_handler.setFormatter(logging.Formatter(file_format))
         file_handler.addFilter(_secret_filter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Log calls only enqueue the record; the listener thread does the
+    # formatting, secret filtering and console/file writes
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
 
     # Also configure twitchio logger
     twitchio_logger = logging.getLogger("twitchio")
     twitchio_logger.setLevel(logging.WARNING)
-    for handler in logger.handlers:
-        twitchio_logger.addHandler(handler)
+    twitchio_logger.addHandler(queue_handler)
 
     logger.debug("Logging initialized with level %s", config.log_level)
 
 
+@atexit.register
+def _stop_queue_listener() -> None:
+    """Flush any queued log records on interpreter exit."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger for a module.
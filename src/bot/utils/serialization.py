@@ -0,0 +1,38 @@
+"""
+JSON helpers with an optional fast path.
+
+Provides:
+- json_dumps: Serialize to a JSON string
+- json_loads: Parse JSON from str or bytes
+
+Uses orjson when installed (the "speedups" extra) and falls back to the
+standard library otherwise. Both produce plain JSON readable by either.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+import json
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize an object to a JSON string."""
+        return orjson.dumps(obj).decode()
+
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize an object to a JSON string."""
+        return json.dumps(obj)
+
+
+__all__ = ["json_dumps", "json_loads"]
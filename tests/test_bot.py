@@ -23,6 +23,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 class TestConfig:
     """Tests for configuration loading."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_config_cache(self) -> None:
+        """Each test sets its own environment, so drop any cached Config."""
+        from bot.config import load_config
+
+        load_config.cache_clear()
+
     def test_config_missing_required_fields(self) -> None:
         """Test that missing required fields raise ValueError."""
         from bot.config import load_config
@@ -151,6 +158,26 @@ class TestConfig:
             assert "secret_client_secret" in secrets
             assert "oauth:secret_token" in secrets
 
+    def test_config_is_cached(self) -> None:
+        """Test that repeated loads reuse the first Config until cleared."""
+        from bot.config import load_config
+
+        env_vars = {
+            "TWITCH_CLIENT_ID": "test_client_id_12345",
+            "TWITCH_CLIENT_SECRET": "test_client_secret_12345",
+            "TWITCH_OAUTH_TOKEN": "oauth:test_token_12345",
+            "TWITCH_BOT_NICK": "testbot",
+            "TWITCH_CHANNELS": "channel1",
+            "BOT_OWNER": "testowner",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=False):
+            config = load_config()
+            assert load_config() is config
+
+            load_config.cache_clear()
+            assert load_config() is not config
+
 
 class TestLogging:
     """Tests for logging utilities."""
@@ -10,11 +10,9 @@ These tests verify:
 
 from __future__ import annotations
 
-import os
 import sys
-import tempfile
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
 import pytest
 
@@ -69,6 +67,14 @@ class TestYouTubeHelpers:
         assert extract_video_id("") is None
         assert extract_video_id("https://youtube.com/") is None
 
+    def test_shorten_title(self) -> None:
+        """Test truncating titles for chat replies."""
+        from bot.cogs.songrequests import shorten_title
+        
+        assert shorten_title("Short", 10) == "Short"
+        assert shorten_title("x" * 10, 10) == "x" * 10
+        assert shorten_title("x" * 11, 10) == "x" * 10 + "..."
+
     def test_format_duration(self) -> None:
         """Test duration formatting."""
         from bot.cogs.songrequests import format_duration
@@ -86,32 +92,13 @@ class TestSongRequestsDatabase:
     """Tests for Song Request database operations."""
 
     @pytest.fixture
-    def temp_db(self):
+    def temp_db(self, tmp_path):
         """Create a temporary database for testing."""
-        # Create temp file
-        fd, path = tempfile.mkstemp(suffix=".db")
-        os.close(fd)
-        
-        # Patch the database path
-        with patch("bot.utils.database.DatabaseManager.__init__") as mock_init:
-            def init_with_temp_path(self, db_path=path):
-                from pathlib import Path
-                self.db_path = Path(db_path)
-                self.db_path.parent.mkdir(parents=True, exist_ok=True)
-                self._init_database()
-            
-            mock_init.side_effect = init_with_temp_path
-            
-            from bot.utils.database import DatabaseManager
-            db = DatabaseManager(db_path=path)
-            
-            yield db
-        
-        # Cleanup
-        try:
-            os.unlink(path)
-        except Exception:
-            pass
+        from bot.utils.database import DatabaseManager
+        
+        db = DatabaseManager(db_path=str(tmp_path / "songrequests.db"))
+        yield db
+        db.close()
 
     @pytest.fixture
     def sr_cog(self, temp_db):
@@ -167,6 +154,17 @@ class TestSongRequestsDatabase:
         assert queue[0]["title"] == "Never Gonna Give You Up"
         assert queue[0]["requested_by"] == "testuser"
 
+    def test_get_queue_preview(self, sr_cog) -> None:
+        """Test getting the first songs of the queue with the total count."""
+        for i in range(7):
+            sr_cog.add_to_queue("testchannel", f"vid{i}", f"Song {i}", 100, "user1", "1")
+        
+        songs, total = sr_cog.get_queue_preview("testchannel", 5)
+        assert total == 7
+        assert [s["title"] for s in songs] == [f"Song {i}" for i in range(5)]
+        
+        assert sr_cog.get_queue_preview("emptychannel") == ([], 0)
+
     def test_get_queue_position(self, sr_cog) -> None:
         """Test getting queue position."""
         # Add multiple songs
@@ -179,6 +177,46 @@ class TestSongRequestsDatabase:
         assert sr_cog.get_queue_position("testchannel", id3) == 3
         assert sr_cog.get_queue_position("testchannel", 9999) == 0
 
+    def test_precheck_request(self, sr_cog) -> None:
+        """Test the combined !sr precheck query."""
+        sr_cog.add_to_queue("testchannel", "vid1", "Song 1", 100, "user1", "1")
+        sr_cog.add_to_queue("testchannel", "vid2", "Song 2", 100, "user2", "2")
+        
+        result = sr_cog._precheck_request("testchannel", "1", "vid2")
+        assert result == {"queue_size": 2, "user_count": 1, "in_queue": True}
+        
+        result = sr_cog._precheck_request("testchannel", "3", "vid3")
+        assert result == {"queue_size": 2, "user_count": 0, "in_queue": False}
+        
+        result = sr_cog._precheck_request("emptychannel", "1", "vid1")
+        assert result == {"queue_size": 0, "user_count": 0, "in_queue": False}
+
+    def test_get_queued_song_at(self, sr_cog) -> None:
+        """Test looking up a queued song by position."""
+        id1 = sr_cog.add_to_queue("testchannel", "vid1", "Song 1", 100, "user1", "1")
+        id2 = sr_cog.add_to_queue("testchannel", "vid2", "Song 2", 100, "user2", "2")
+        id3 = sr_cog.add_to_queue("testchannel", "vid3", "Song 3", 100, "user3", "3")
+        sr_cog.mark_song_playing(id1)
+        
+        # The playing song is not counted
+        assert sr_cog.get_queued_song_at("testchannel", 1)["id"] == id2
+        assert sr_cog.get_queued_song_at("testchannel", 2)["id"] == id3
+        assert sr_cog.get_queued_song_at("testchannel", 3) is None
+        assert sr_cog.get_queued_count("testchannel") == 2
+
+    def test_move_song_to_front(self, sr_cog) -> None:
+        """Test that promoted songs jump the queue, latest promotion first."""
+        id1 = sr_cog.add_to_queue("testchannel", "vid1", "Song 1", 100, "user1", "1")
+        id2 = sr_cog.add_to_queue("testchannel", "vid2", "Song 2", 100, "user2", "2")
+        id3 = sr_cog.add_to_queue("testchannel", "vid3", "Song 3", 100, "user3", "3")
+        
+        sr_cog.move_song_to_front(id2)
+        sr_cog.move_song_to_front(id3)
+        
+        assert [s["id"] for s in sr_cog.get_queue("testchannel")] == [id3, id2, id1]
+        assert sr_cog.get_next_song("testchannel")["id"] == id3
+        assert sr_cog.get_queue_position("testchannel", id1) == 3
+
     def test_get_user_queue_count(self, sr_cog) -> None:
         """Test counting user's songs in queue."""
         sr_cog.add_to_queue("testchannel", "vid1", "Song 1", 100, "user1", "1")
@@ -200,6 +238,25 @@ class TestSongRequestsDatabase:
         
         assert len(sr_cog.get_queue("testchannel")) == 0
 
+    def test_remove_video_from_queue(self, sr_cog) -> None:
+        """Test removing every queued copy of a video."""
+        id1 = sr_cog.add_to_queue("testchannel", "vid1", "Song 1", 100, "user1", "1")
+        sr_cog.add_to_queue("testchannel", "vid1", "Song 1", 100, "user2", "2")
+        sr_cog.add_to_queue("testchannel", "vid2", "Song 2", 100, "user3", "3")
+        sr_cog.mark_song_playing(id1)
+        
+        assert sr_cog.remove_video_from_queue("testchannel", "vid1") == 1
+        # The playing copy is left alone
+        assert [s["video_id"] for s in sr_cog.get_queue("testchannel")] == ["vid1", "vid2"]
+        assert sr_cog.get_known_title("testchannel", "vid2") == "Song 2"
+        assert sr_cog.get_known_title("testchannel", "vid9") is None
+        
+        # Played songs are still found once they leave the queue table
+        sr_cog.mark_song_played(id1)
+        with sr_cog.db.get_connection() as conn:
+            conn.execute("DELETE FROM song_queue")
+        assert sr_cog.get_known_title("testchannel", "vid1") == "Song 1"
+
     def test_clear_queue(self, sr_cog) -> None:
         """Test clearing the entire queue."""
         sr_cog.add_to_queue("testchannel", "vid1", "Song 1", 100, "user1", "1")
@@ -241,22 +298,23 @@ class TestSongRequestsDatabase:
 
     def test_blacklist_song(self, sr_cog) -> None:
         """Test blacklisting a song."""
-        assert sr_cog.is_song_blacklisted("testchannel", "vid1") is False
+        # Blacklist checks normalize IDs, so these must be real 11-character IDs
+        assert sr_cog.is_song_blacklisted("testchannel", "dQw4w9WgXcQ") is False
         
-        sr_cog.add_to_blacklist("testchannel", "vid1", None, "Test reason", "mod1")
+        sr_cog.add_to_blacklist("testchannel", "dQw4w9WgXcQ", None, "Test reason", "mod1")
         
-        assert sr_cog.is_song_blacklisted("testchannel", "vid1") is True
-        assert sr_cog.is_song_blacklisted("testchannel", "vid2") is False
+        assert sr_cog.is_song_blacklisted("testchannel", "dQw4w9WgXcQ") is True
+        assert sr_cog.is_song_blacklisted("testchannel", "9bZkp7q19f0") is False
 
     def test_remove_from_blacklist(self, sr_cog) -> None:
         """Test removing a song from blacklist."""
-        sr_cog.add_to_blacklist("testchannel", "vid1", None, "Test reason", "mod1")
-        assert sr_cog.is_song_blacklisted("testchannel", "vid1") is True
+        sr_cog.add_to_blacklist("testchannel", "dQw4w9WgXcQ", None, "Test reason", "mod1")
+        assert sr_cog.is_song_blacklisted("testchannel", "dQw4w9WgXcQ") is True
         
-        result = sr_cog.remove_from_blacklist("testchannel", "vid1")
+        result = sr_cog.remove_from_blacklist("testchannel", "dQw4w9WgXcQ")
         assert result is True
         
-        assert sr_cog.is_song_blacklisted("testchannel", "vid1") is False
+        assert sr_cog.is_song_blacklisted("testchannel", "dQw4w9WgXcQ") is False
 
     def test_get_user_last_request(self, sr_cog) -> None:
         """Test getting user's last request."""
@@ -296,23 +354,25 @@ class TestSongRequestsIntegration:
         ctx.author.is_subscriber = False
         return ctx
 
-    def test_youtube_info_extraction(self) -> None:
+    async def test_youtube_info_extraction(self) -> None:
         """Test that YouTube info extraction works with valid URL."""
         from bot.cogs.songrequests import get_youtube_info
         
         # This test requires network access, so we mock it
-        with patch("urllib.request.urlopen") as mock_urlopen:
-            mock_response = MagicMock()
-            mock_response.read.return_value = b'{"title": "Test Video", "author_name": "Test Channel"}'
-            mock_response.__enter__ = MagicMock(return_value=mock_response)
-            mock_response.__exit__ = MagicMock(return_value=False)
-            mock_urlopen.return_value = mock_response
-            
-            info = get_youtube_info("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
-            
-            assert info is not None
-            assert info["video_id"] == "dQw4w9WgXcQ"
-            assert info["title"] == "Test Video"
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json = AsyncMock(
+            return_value={"title": "Test Video", "author_name": "Test Channel"}
+        )
+        mock_session = MagicMock()
+        mock_session.get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
+        mock_session.get.return_value.__aexit__ = AsyncMock(return_value=False)
+        
+        info = await get_youtube_info(mock_session, "https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        
+        assert info is not None
+        assert info["video_id"] == "dQw4w9WgXcQ"
+        assert info["title"] == "Test Video"
 
 
 if __name__ == "__main__":